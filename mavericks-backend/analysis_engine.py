@@ -0,0 +1,120 @@
+"""
+Local Assessment Analysis Engine
+Scores submissions per skill without calling the LLM
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+# Skill level thresholds (percent correct)
+STRONG_THRESHOLD = 80
+AVERAGE_THRESHOLD = 50
+
+
+def classify_skill_level(score: float) -> str:
+    """Classify a per-skill score as STRONG, AVERAGE or WEAK"""
+    if score >= STRONG_THRESHOLD:
+        return "STRONG"
+    if score >= AVERAGE_THRESHOLD:
+        return "AVERAGE"
+    return "WEAK"
+
+
+def compute_skill_scores(questions: List[Dict], checked_answers: Dict[str, str], skills: List[str]) -> Dict[str, Dict]:
+    """Compute correct/total/score/level per skill from each answered question's skill field"""
+    questions_by_id = {question["id"]: question for question in questions}
+    lookup = {skill.lower(): skill for skill in skills}
+    default_skill = skills[0] if len(skills) == 1 else None
+
+    tallies = {}
+    for question_id, result in checked_answers.items():
+        question = questions_by_id.get(question_id)
+        if not question:
+            continue
+        label = str(question.get("skill", ""))
+        # Match the tested skill case-insensitively; keep unknown labels as their own skill
+        skill = lookup.get(label.lower()) or default_skill or label or "General"
+        tally = tallies.setdefault(skill, [0, 0])
+        tally[1] += 1
+        if result == "correct":
+            tally[0] += 1
+
+    skill_scores = {}
+    for skill, (correct, total) in tallies.items():
+        score = round(correct / total * 100, 1) if total else 0.0
+        skill_scores[skill] = {
+            "correct": correct,
+            "total": total,
+            "score": score,
+            "level": classify_skill_level(score)
+        }
+    return skill_scores
+
+
+# Memoized analysis results keyed by outcome signature
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "2048"))
+ANALYSIS_CACHE_TTL_SECONDS = float(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "3600"))
+
+# Score bucket width; every threshold used by the analysis (40/50/60/80) falls on a boundary
+SCORE_BUCKET_WIDTH = 10
+
+
+def score_bucket(score: float) -> int:
+    """Lower bound of the bucket a score falls in (100 gets its own bucket)"""
+    return int(score // SCORE_BUCKET_WIDTH) * SCORE_BUCKET_WIDTH
+
+
+def outcome_signature(skills: List[str], skill_scores: Dict[str, Dict], score: float, difficulty: str) -> Tuple:
+    """Normalized key for an assessment outcome: equal signatures get identical analyses.
+
+    Skill names keep their case, since the memoized weak skills, videos and learning path
+    echo them back to the caller"""
+    return (
+        tuple(sorted(skills)),
+        tuple(sorted((skill, score_bucket(result["score"])) for skill, result in skill_scores.items())),
+        score_bucket(score),
+        difficulty
+    )
+
+
+class BoundedTTLCache:
+    """Thread-safe LRU cache with a maximum size and per-entry time to live"""
+
+    def __init__(self, max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES, ttl_seconds: float = ANALYSIS_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry[0] >= self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Outcome-dependent parts of an analysis (weak skills, videos, plan) and LLM narratives
+analysis_cache = BoundedTTLCache()
+narrative_cache = BoundedTTLCache()
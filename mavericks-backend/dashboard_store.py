@@ -0,0 +1,159 @@
+"""
+Materialized User Dashboards
+Per-user dashboard documents kept up to date as events happen, so serving a
+dashboard is a dictionary lookup instead of a recomputation
+"""
+
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from assessment_cache import encode_json
+
+# Distinguishes ETags issued by different processes/restarts (versions restart at 0)
+BOOT_ID = format(int(time.time() * 1000) & 0xFFFFFFFF, "x")
+
+# Bounded history kept in each document
+MAX_PAST_ASSESSMENTS = 20
+MAX_PROGRESS_ENTRIES = 50
+MAX_VIDEOS = 20
+
+
+def _iso(at: Optional[datetime] = None) -> str:
+    return (at or datetime.now()).isoformat(timespec="seconds")
+
+
+def empty_dashboard(user_id: str) -> Dict:
+    """Dashboard document for a user with no activity yet"""
+    return {
+        "user_id": user_id,
+        "profile": {
+            "name": None,
+            "email": None,
+            "joined": datetime.now().strftime("%Y-%m-%d"),
+            "skills": [],
+            "badges": []
+        },
+        "progress_tracker": [],
+        "learning_path": [],
+        "assessments": {
+            "upcoming": [],
+            "past": []
+        },
+        "videos": [],
+        "hackathons": {
+            "available": [],
+            "applied": []
+        }
+    }
+
+
+class DashboardStore:
+    """Versioned dashboard documents with cached JSON bytes per version"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents: Dict[str, Dict] = {}
+        self._versions: Dict[str, int] = {}
+        self._encoded: Dict[str, Tuple[int, bytes]] = {}
+
+    def _document(self, user_id: str) -> Dict:
+        document = self._documents.get(user_id)
+        if document is None:
+            document = empty_dashboard(user_id)
+            self._documents[user_id] = document
+            self._versions[user_id] = 0
+        return document
+
+    def _touch(self, user_id: str):
+        self._versions[user_id] += 1
+
+    def _add_milestone(self, document: Dict, milestone: str, once: bool = False, at: Optional[datetime] = None):
+        tracker = document["progress_tracker"]
+        if once and any(entry["milestone"] == milestone for entry in tracker):
+            return
+        tracker.append({"milestone": milestone, "timestamp": _iso(at)})
+        del tracker[:-MAX_PROGRESS_ENTRIES]
+
+    def record_assessment(self, user_id: str, assessment: Dict, analysis: Dict, at: Optional[datetime] = None):
+        """Fold a graded submission into the user's dashboard (at: when it happened, for replays)"""
+        with self._lock:
+            document = self._document(user_id)
+            self._add_milestone(document, "Profile Created", once=True, at=at)
+            profile_skills = document["profile"]["skills"]
+            for skill in assessment.get("skills_tested", []):
+                if skill not in profile_skills:
+                    profile_skills.append(skill)
+
+            past = document["assessments"]["past"]
+            past.insert(0, {
+                "assessment_id": assessment["assessment_id"],
+                "title": assessment.get("title", "Assessment"),
+                "score": round(analysis["score"], 1),
+                "weak_skills": list(analysis.get("weak_skills", [])),
+                "date": (at or datetime.now()).strftime("%Y-%m-%d")
+            })
+            del past[MAX_PAST_ASSESSMENTS:]
+
+            self._add_milestone(document, "Assessment Completed", at=at)
+            self._add_milestone(document, "Skills Evaluated", once=True, at=at)
+            self._touch(user_id)
+
+    def record_video_upload(self, user_id: str, skill: Optional[str], video_url: str, uploaded_at: int,
+                            at: Optional[datetime] = None):
+        """Add an uploaded skill video to the user's dashboard"""
+        with self._lock:
+            document = self._document(user_id)
+            self._add_milestone(document, "Profile Created", once=True, at=at)
+            videos = document["videos"]
+            videos.insert(0, {"skill": skill, "video_url": video_url, "uploaded_at": uploaded_at})
+            del videos[MAX_VIDEOS:]
+            self._add_milestone(document, "Skill Video Uploaded", at=at)
+            self._touch(user_id)
+
+    def update_section(self, user_id: str, section: str, value):
+        """Replace one top-level section of a dashboard (e.g. learning_path)"""
+        with self._lock:
+            self._document(user_id)[section] = value
+            self._touch(user_id)
+
+    def get(self, user_id: str, live_sections: Optional[Dict] = None) -> Tuple[str, bytes]:
+        """Return (etag, encoded JSON) for a user's dashboard, encoding once per version.
+
+        live_sections are small blocks computed per request (e.g. the leaderboard
+        position); they are spliced into the cached bytes and folded into the ETag.
+        """
+        live = encode_json(live_sections) if live_sections else b""
+        with self._lock:
+            document = self._documents.get(user_id)
+            if document is None:
+                # Unknown users get an empty document without allocating a stored one
+                version, body = 0, encode_json(empty_dashboard(user_id))
+            else:
+                version = self._versions[user_id]
+                cached = self._encoded.get(user_id)
+                if cached is None or cached[0] != version:
+                    cached = (version, encode_json(document))
+                    self._encoded[user_id] = cached
+                body = cached[1]
+        if live:
+            body = body[:-1] + b"," + live[1:]
+        return self._etag(user_id, version, live), body
+
+    def etag(self, user_id: str, live_sections: Optional[Dict] = None) -> str:
+        """Current ETag without encoding the document"""
+        live = encode_json(live_sections) if live_sections else b""
+        with self._lock:
+            return self._etag(user_id, self._versions.get(user_id, 0), live)
+
+    def _etag(self, user_id: str, version: int, live: bytes = b"") -> str:
+        return f'"{user_id}-{BOOT_ID}-{version}-{zlib.crc32(live):08x}"'
+
+    def user_count(self) -> int:
+        return len(self._documents)
+
+
+# Shared store for this process
+dashboard_store = DashboardStore()
@@ -0,0 +1,180 @@
+"""
+Write-Behind Event Store
+Submissions and video uploads are queued in memory and written to SQLite (WAL mode)
+in batches by a background thread, so requests never wait on the disk
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterator, Optional
+
+EVENT_STORE_PATH = os.getenv(
+    "EVENT_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "events.db")
+)
+
+# Flush when this many events are pending or when the oldest has waited this long
+EVENT_FLUSH_BATCH = int(os.getenv("EVENT_FLUSH_BATCH", "200"))
+EVENT_FLUSH_SECONDS = float(os.getenv("EVENT_FLUSH_SECONDS", "1.0"))
+
+# Pending events held in memory; beyond this new events are refused (backpressure)
+EVENT_BUFFER_MAX = int(os.getenv("EVENT_BUFFER_MAX", "10000"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    user_id TEXT,
+    created_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_kind ON events (kind, id);
+"""
+
+
+class WriteBehindStore:
+    """Bounded in-memory buffer drained to SQLite in batches by one writer thread"""
+
+    def __init__(self, path: str = EVENT_STORE_PATH, batch_size: int = EVENT_FLUSH_BATCH,
+                 flush_seconds: float = EVENT_FLUSH_SECONDS, max_pending: int = EVENT_BUFFER_MAX):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.written = 0
+        self.refused = 0
+        self.flushes = 0
+        self.errors = 0
+        # Failures since the last successful flush; drives the retry backoff
+        self._failures = 0
+        self.last_flush_ms = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # WAL makes NORMAL safe against corruption; only the last batch can be lost on power failure
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def start(self):
+        """Open the database and start the background writer"""
+        if self._thread is not None:
+            return
+        self._connect()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Flush everything still pending and stop the writer (graceful shutdown)"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def saturated(self) -> bool:
+        """True if the buffer is full because the disk is falling behind"""
+        with self._condition:
+            return len(self._pending) >= self.max_pending
+
+    def append(self, kind: str, payload: Dict, user_id: Optional[str] = None) -> bool:
+        """Queue an event; returns False (and counts it) if the buffer is full"""
+        event = (kind, user_id, time.time(), json.dumps(payload, separators=(",", ":")))
+        with self._condition:
+            if len(self._pending) >= self.max_pending:
+                self.refused += 1
+                return False
+            self._pending.append(event)
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if len(self._pending) < self.batch_size and not self._stopping:
+                    self._condition.wait(self.flush_seconds)
+                if self._stopping:
+                    return
+            try:
+                self.flush()
+                self._failures = 0
+            except Exception as e:
+                # Any failure (SQLite, disk, ...) keeps the writer alive: events stay queued
+                # and new ones are refused once the buffer fills
+                self.errors += 1
+                self._failures += 1
+                print(f"⚠️ Event store flush failed: {e}")
+                time.sleep(min(30.0, self.flush_seconds * 2 ** min(self._failures, 5)))
+
+    def flush(self) -> int:
+        """Write all pending events in batches; returns how many were written"""
+        total = 0
+        with self._flush_lock:
+            while True:
+                with self._condition:
+                    batch = [self._pending[i] for i in range(min(self.batch_size, len(self._pending)))]
+                if not batch:
+                    return total
+                started = time.perf_counter()
+                connection = self._connect()
+                with connection:
+                    connection.executemany(
+                        "INSERT INTO events (kind, user_id, created_at, payload) VALUES (?, ?, ?, ?)", batch
+                    )
+                # Only drop events from the buffer once they are committed
+                with self._condition:
+                    for _ in batch:
+                        self._pending.popleft()
+                self.written += len(batch)
+                self.flushes += 1
+                self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+                total += len(batch)
+
+    def replay(self, kind: str) -> Iterator[Dict]:
+        """Stored events of one kind, oldest first (used to rebuild in-memory state)"""
+        if not os.path.exists(self.path):
+            return
+        with self._flush_lock:
+            rows = self._connect().execute(
+                "SELECT user_id, created_at, payload FROM events WHERE kind = ? ORDER BY id", (kind,)
+            ).fetchall()
+        for user_id, created_at, payload in rows:
+            yield {"user_id": user_id, "created_at": created_at, **json.loads(payload)}
+
+    def stats(self) -> Dict:
+        with self._condition:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "max_pending": self.max_pending,
+            "written": self.written,
+            "refused": self.refused,
+            "flushes": self.flushes,
+            "errors": self.errors,
+            "last_flush_ms": self.last_flush_ms
+        }
+
+
+# Shared store for this process
+event_store = WriteBehindStore()
@@ -0,0 +1,267 @@
+"""
+Leaderboard Engine
+Incrementally maintained leaderboards (overall, per-skill and weekly) backed by an
+indexable skip list, so top-k, a user's rank and the window around a user are all
+answered in O(log n) instead of sorting every user per request
+"""
+
+import math
+import random
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Weekly boards older than this many weeks are dropped
+WEEKLY_BOARDS_KEPT = 2
+
+
+class _Infinity:
+    """Sentinel value greater than every stored value"""
+
+    def __lt__(self, other):
+        return False
+
+    def __le__(self, other):
+        return self is other
+
+    def __gt__(self, other):
+        return self is not other
+
+    def __ge__(self, other):
+        return True
+
+
+class _Node:
+    __slots__ = ("value", "next", "width")
+
+    def __init__(self, value, next_nodes, widths):
+        self.value = value
+        self.next = next_nodes
+        self.width = widths
+
+
+_NIL = _Node(_Infinity(), [], [])
+
+
+class IndexableSkipList:
+    """Sorted container with O(log n) insert, remove, positional lookup and rank"""
+
+    def __init__(self, expected_size: int = 1 << 20):
+        self.size = 0
+        self.maxlevels = int(1 + math.log2(expected_size))
+        self.head = _Node("HEAD", [_NIL] * self.maxlevels, [1] * self.maxlevels)
+
+    def __len__(self):
+        return self.size
+
+    def insert(self, value):
+        # Find the last node before value on every level, counting steps as we go
+        chain = [None] * self.maxlevels
+        steps_at_level = [0] * self.maxlevels
+        node = self.head
+        for level in reversed(range(self.maxlevels)):
+            while node.next[level].value <= value:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        height = min(self.maxlevels, 1 - int(math.log(random.random() or 1e-12, 2.0)))
+        new_node = _Node(value, [None] * height, [None] * height)
+        steps = 0
+        for level in range(height):
+            previous = chain[level]
+            new_node.next[level] = previous.next[level]
+            previous.next[level] = new_node
+            new_node.width[level] = previous.width[level] - steps
+            previous.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(height, self.maxlevels):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, value):
+        chain = [None] * self.maxlevels
+        node = self.head
+        for level in reversed(range(self.maxlevels)):
+            while node.next[level].value < value:
+                node = node.next[level]
+            chain[level] = node
+        target = chain[0].next[0]
+        if target is _NIL or target.value != value:
+            raise KeyError(value)
+        for level in range(len(target.next)):
+            previous = chain[level]
+            previous.width[level] += target.width[level] - 1
+            previous.next[level] = target.next[level]
+        for level in range(len(target.next), self.maxlevels):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def index(self, value) -> int:
+        """0-based position of value"""
+        node = self.head
+        position = 0
+        for level in reversed(range(self.maxlevels)):
+            while node.next[level].value < value:
+                position += node.width[level]
+                node = node.next[level]
+        target = node.next[0]
+        if target is _NIL or target.value != value:
+            raise KeyError(value)
+        return position
+
+    def slice(self, start: int, stop: int) -> List:
+        """Values at positions [start, stop): O(log n + k)"""
+        start = max(0, start)
+        stop = min(self.size, stop)
+        if start >= stop:
+            return []
+        node = self.head
+        remaining = start + 1
+        for level in reversed(range(self.maxlevels)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        values = []
+        for _ in range(stop - start):
+            values.append(node.value)
+            node = node.next[0]
+        return values
+
+
+class Leaderboard:
+    """Users ranked by points (highest first, ties broken by user id)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._points: Dict[str, float] = {}
+        self._ranking = IndexableSkipList()
+
+    def __len__(self):
+        return len(self._points)
+
+    def set_points(self, user_id: str, points: float):
+        old = self._points.get(user_id)
+        if old == points:
+            return
+        if old is not None:
+            self._ranking.remove((-old, user_id))
+        self._points[user_id] = points
+        self._ranking.insert((-points, user_id))
+
+    def _entries(self, start: int, values) -> List[Dict]:
+        return [
+            {"rank": start + i + 1, "user_id": user_id, "points": -negated}
+            for i, (negated, user_id) in enumerate(values)
+        ]
+
+    def top(self, k: int) -> List[Dict]:
+        return self._entries(0, self._ranking.slice(0, k))
+
+    def rank(self, user_id: str) -> Optional[int]:
+        """1-based rank, or None if the user is not on this board"""
+        points = self._points.get(user_id)
+        if points is None:
+            return None
+        return self._ranking.index((-points, user_id)) + 1
+
+    def around(self, user_id: str, radius: int = 2) -> List[Dict]:
+        """The user's entry with up to `radius` neighbours on each side"""
+        rank = self.rank(user_id)
+        if rank is None:
+            return []
+        start = max(0, rank - 1 - radius)
+        return self._entries(start, self._ranking.slice(start, rank + radius))
+
+
+def week_key(when: Optional[datetime] = None) -> str:
+    """ISO week label such as 2025-W07"""
+    year, week, _ = (when or datetime.now()).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class LeaderboardEngine:
+    """Keeps the overall, per-skill and weekly boards in step with graded submissions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._boards: Dict[str, Leaderboard] = {}
+        # user -> skill -> best score, overall and per week
+        self._best: Dict[str, Dict[str, float]] = {}
+        self._weekly_best: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    def _board(self, name: str) -> Leaderboard:
+        board = self._boards.get(name)
+        if board is None:
+            board = Leaderboard(name)
+            self._boards[name] = board
+        return board
+
+    def record_submission(self, user_id: str, skill_scores: Dict[str, Dict], when: Optional[datetime] = None):
+        """Update every affected board: points are the sum of the user's best per-skill scores"""
+        week = week_key(when)
+        with self._lock:
+            best = self._best.setdefault(user_id, {})
+            weekly = self._weekly_best.setdefault(week, {}).setdefault(user_id, {})
+            for skill, result in skill_scores.items():
+                skill_name = skill.lower()
+                if result["score"] > best.get(skill_name, -1):
+                    best[skill_name] = result["score"]
+                    self._board(f"skill:{skill_name}").set_points(user_id, result["score"])
+                weekly[skill_name] = max(weekly.get(skill_name, 0), result["score"])
+            self._board("overall").set_points(user_id, round(sum(best.values()), 1))
+            self._board(f"week:{week}").set_points(user_id, round(sum(weekly.values()), 1))
+            self._prune_weeks()
+
+    def _prune_weeks(self):
+        weeks = sorted(self._weekly_best)
+        for old_week in weeks[:-WEEKLY_BOARDS_KEPT]:
+            del self._weekly_best[old_week]
+            self._boards.pop(f"week:{old_week}", None)
+
+    def resolve(self, board: str) -> str:
+        """Map friendly board names ("weekly", a skill name) to internal keys"""
+        if not board or board == "overall":
+            return "overall"
+        if board == "weekly":
+            return f"week:{week_key()}"
+        if board.startswith(("skill:", "week:")):
+            return board
+        return f"skill:{board.lower()}"
+
+    def top(self, board: str, k: int) -> Tuple[int, List[Dict]]:
+        with self._lock:
+            leaderboard = self._boards.get(self.resolve(board))
+            if leaderboard is None:
+                return 0, []
+            return len(leaderboard), leaderboard.top(k)
+
+    def standing(self, board: str, user_id: str, radius: int = 2) -> Dict:
+        with self._lock:
+            leaderboard = self._boards.get(self.resolve(board))
+            if leaderboard is None:
+                return {"rank": None, "total_users": 0, "window": []}
+            return {
+                "rank": leaderboard.rank(user_id),
+                "total_users": len(leaderboard),
+                "window": leaderboard.around(user_id, radius)
+            }
+
+    def dashboard_block(self, user_id: str) -> Dict:
+        """Leaderboard section of the user dashboard"""
+        standing = self.standing("overall", user_id, radius=0)
+        position, total = standing["rank"], standing["total_users"]
+        achievements = []
+        if position is not None:
+            if position <= 10:
+                achievements.append(f"Top {position if position <= 3 else 10} performer")
+            elif total and position / total <= 0.05:
+                achievements.append("Top 5% performer")
+            weekly_rank = self.standing("weekly", user_id, radius=0)["rank"]
+            if weekly_rank is not None and weekly_rank <= 5:
+                achievements.append(f"#{weekly_rank} this week")
+        return {"position": position, "total_users": total, "achievements": achievements}
+
+
+# Shared engine for this process
+leaderboards = LeaderboardEngine()
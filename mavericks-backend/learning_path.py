@@ -0,0 +1,203 @@
+"""
+Learning Path Engine
+Orders weak skills and their missing prerequisites with a topological sort over a
+static skill prerequisite DAG, memoized per (weak skills, known skills) so users
+with the same gaps share one computed path
+"""
+
+import heapq
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from skill_matcher import SKILL_ALIASES
+
+
+class SkillNode(NamedTuple):
+    name: str
+    hours: int
+    difficulty: str
+    prerequisites: Tuple[str, ...]
+    topics: Tuple[str, ...]
+
+
+def _node(name: str, hours: int, difficulty: str, prerequisites=(), topics=()) -> SkillNode:
+    return SkillNode(name, hours, difficulty, tuple(prerequisites), tuple(topics))
+
+
+# Prerequisite DAG keyed by lower-case skill name
+SKILL_PREREQUISITES: Dict[str, SkillNode] = {
+    "programming fundamentals": _node("Programming Fundamentals", 4, "Beginner", (),
+                                      ["Variables & Types", "Control Flow", "Functions", "Debugging"]),
+    "git": _node("Git", 2, "Beginner", (), ["Commits & Branches", "Merging", "Pull Requests"]),
+    "bash": _node("Bash", 3, "Beginner", (), ["Shell Navigation", "Pipes & Redirection", "Scripting"]),
+    "statistics": _node("Statistics", 5, "Beginner", (), ["Descriptive Statistics", "Probability", "Hypothesis Testing"]),
+    "html": _node("HTML", 2, "Beginner", (), ["Semantic Markup", "Forms", "Accessibility"]),
+    "css": _node("CSS", 3, "Beginner", ["html"], ["Selectors", "Box Model", "Flexbox & Grid", "Responsive Design"]),
+    "javascript": _node("JavaScript", 6, "Beginner", ["programming fundamentals", "html"],
+                        ["Variables & Data Types", "Functions & Scope", "DOM Manipulation", "ES6 Features"]),
+    "typescript": _node("TypeScript", 4, "Intermediate", ["javascript"], ["Type Annotations", "Interfaces", "Generics"]),
+    "react": _node("React", 6, "Intermediate", ["javascript", "css"],
+                   ["Components & Props", "State Management", "Hooks", "Event Handling"]),
+    "react native": _node("React Native", 5, "Advanced", ["react"], ["Native Components", "Navigation", "Device APIs"]),
+    "angular": _node("Angular", 6, "Intermediate", ["typescript", "css"], ["Components", "Services & DI", "RxJS"]),
+    "vue": _node("Vue", 5, "Intermediate", ["javascript", "css"], ["Templates", "Reactivity", "Components"]),
+    "node.js": _node("Node.js", 5, "Intermediate", ["javascript"], ["Event Loop", "Modules", "File System", "npm"]),
+    "express": _node("Express", 3, "Intermediate", ["node.js"], ["Routing", "Middleware", "API Design"]),
+    "python": _node("Python", 6, "Beginner", ["programming fundamentals"],
+                    ["Syntax & Data Types", "Functions", "Modules", "OOP"]),
+    "flask": _node("Flask", 3, "Intermediate", ["python"], ["Routing", "Templates", "REST APIs"]),
+    "django": _node("Django", 6, "Intermediate", ["python", "sql"], ["Models & ORM", "Views", "Admin", "Authentication"]),
+    "numpy": _node("NumPy", 3, "Intermediate", ["python"], ["Arrays", "Broadcasting", "Vectorization"]),
+    "pandas": _node("Pandas", 4, "Intermediate", ["numpy"], ["DataFrames", "Cleaning Data", "Grouping & Aggregation"]),
+    "matplotlib": _node("Matplotlib", 2, "Intermediate", ["numpy"], ["Plots", "Customization"]),
+    "machine learning": _node("Machine Learning", 10, "Advanced", ["pandas", "statistics"],
+                              ["Supervised Learning", "Model Evaluation", "Feature Engineering"]),
+    "scikit-learn": _node("Scikit-Learn", 4, "Advanced", ["machine learning"], ["Pipelines", "Cross-Validation", "Model Selection"]),
+    "deep learning": _node("Deep Learning", 10, "Advanced", ["machine learning"], ["Neural Networks", "Backpropagation", "CNNs & RNNs"]),
+    "tensorflow": _node("TensorFlow", 6, "Advanced", ["deep learning"], ["Keras API", "Training Loops", "Deployment"]),
+    "pytorch": _node("PyTorch", 6, "Advanced", ["deep learning"], ["Tensors", "Autograd", "Training Loops"]),
+    "sql": _node("SQL", 4, "Beginner", (), ["SELECT Queries", "Joins", "Aggregation", "Indexing"]),
+    "mysql": _node("MySQL", 3, "Intermediate", ["sql"], ["Administration", "Storage Engines", "Performance Tuning"]),
+    "postgresql": _node("PostgreSQL", 3, "Intermediate", ["sql"], ["Advanced Types", "Indexes", "Query Planning"]),
+    "mongodb": _node("MongoDB", 3, "Intermediate", ["javascript"], ["Documents & Collections", "Queries", "Aggregation Pipeline"]),
+    "java": _node("Java", 8, "Beginner", ["programming fundamentals"], ["OOP", "Collections", "Exceptions", "Streams"]),
+    "spring": _node("Spring", 6, "Advanced", ["java", "sql"], ["Spring Boot", "Dependency Injection", "REST Controllers"]),
+    "c++": _node("C++", 8, "Intermediate", ["programming fundamentals"], ["Pointers & Memory", "Classes", "STL"]),
+    "docker": _node("Docker", 4, "Intermediate", ["bash"], ["Images", "Containers", "Dockerfiles", "Compose"]),
+    "kubernetes": _node("Kubernetes", 6, "Advanced", ["docker"], ["Pods & Deployments", "Services", "Configuration"]),
+    "aws": _node("AWS", 6, "Intermediate", ["bash"], ["EC2 & S3", "IAM", "Networking"]),
+    "terraform": _node("Terraform", 4, "Advanced", ["aws"], ["Providers", "State", "Modules"]),
+    "jenkins": _node("Jenkins", 3, "Intermediate", ["git"], ["Pipelines", "Build Triggers"]),
+}
+
+# Skills outside the DAG still get a module of this size
+DEFAULT_MODULE_HOURS = 5
+
+
+def skill_key(skill: str) -> str:
+    """DAG key for a skill name or alias"""
+    key = skill.strip().lower()
+    key = SKILL_ALIASES.get(key, key)
+    return {"reactjs": "react", "react.js": "react", "nodejs": "node.js"}.get(key, key)
+
+
+def _check_acyclic(graph: Dict[str, SkillNode]):
+    """Fail fast at import if the prerequisite table has a cycle or a dangling edge"""
+    state: Dict[str, int] = {}
+
+    def visit(key: str, trail: Tuple[str, ...]):
+        if state.get(key) == 2:
+            return
+        if state.get(key) == 1:
+            raise ValueError(f"Cycle in skill prerequisites: {' -> '.join(trail + (key,))}")
+        state[key] = 1
+        for prerequisite in graph[key].prerequisites:
+            if prerequisite not in graph:
+                raise ValueError(f"Unknown prerequisite {prerequisite!r} for {key!r}")
+            visit(prerequisite, trail + (key,))
+        state[key] = 2
+
+    for key in graph:
+        visit(key, ())
+
+
+_check_acyclic(SKILL_PREREQUISITES)
+
+
+def _module_for(key: str, display: str, reason: str) -> Dict:
+    node = SKILL_PREREQUISITES.get(key)
+    if node is None:
+        return {
+            "skill": display,
+            "name": f"{display} Essentials",
+            "time": f"{DEFAULT_MODULE_HOURS} hrs",
+            "estimated_hours": DEFAULT_MODULE_HOURS,
+            "difficulty": "Intermediate",
+            "description": f"Build a solid foundation in {display}",
+            "topics": [],
+            "prerequisites": [],
+            "reason": reason
+        }
+    return {
+        "skill": node.name,
+        "name": f"{node.name} Essentials",
+        "time": f"{node.hours} hrs",
+        "estimated_hours": node.hours,
+        "difficulty": node.difficulty,
+        "description": f"Strengthen your {node.name} skills: {', '.join(node.topics[:3])}" if node.topics else f"Strengthen your {node.name} skills",
+        "topics": list(node.topics),
+        "prerequisites": [SKILL_PREREQUISITES[p].name for p in node.prerequisites],
+        "reason": reason
+    }
+
+
+@lru_cache(maxsize=4096)
+def _cached_path(weak: Tuple[str, ...], known: Tuple[str, ...], names: Tuple[str, ...]) -> Tuple[Dict, ...]:
+    display = dict(zip(weak, names))
+    known_set = set(known)
+
+    # Weak skills plus every prerequisite the user has not demonstrated
+    needed: Dict[str, Optional[str]] = {key: None for key in weak}
+    stack = list(weak)
+    while stack:
+        key = stack.pop()
+        node = SKILL_PREREQUISITES.get(key)
+        if node is None:
+            continue
+        for prerequisite in node.prerequisites:
+            if prerequisite not in known_set and prerequisite not in needed:
+                needed[prerequisite] = key
+                stack.append(prerequisite)
+
+    # Kahn's algorithm over the needed sub-graph; ties broken by difficulty then name for stable output
+    levels = {"Beginner": 0, "Intermediate": 1, "Advanced": 2}
+    dependents: Dict[str, List[str]] = {key: [] for key in needed}
+    indegree = {key: 0 for key in needed}
+    for key in needed:
+        node = SKILL_PREREQUISITES.get(key)
+        for prerequisite in (node.prerequisites if node else ()):
+            if prerequisite in needed:
+                indegree[key] += 1
+                dependents[prerequisite].append(key)
+
+    def priority(key: str):
+        node = SKILL_PREREQUISITES.get(key)
+        return (levels[node.difficulty] if node else 1, key)
+
+    ready = [priority(key) for key, degree in indegree.items() if degree == 0]
+    heapq.heapify(ready)
+    modules = []
+    while ready:
+        _, key = heapq.heappop(ready)
+        required_by = needed[key]
+        if required_by is None:
+            reason = "Weak skill in your assessment"
+        else:
+            reason = f"Prerequisite for {display.get(required_by) or SKILL_PREREQUISITES[required_by].name}"
+        modules.append(_module_for(key, display.get(key, key), reason))
+        for dependent in dependents[key]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                heapq.heappush(ready, priority(dependent))
+    return tuple(modules)
+
+
+def build_learning_path(weak_skills: Iterable[str], known_skills: Iterable[str] = ()) -> List[Dict]:
+    """Ordered modules covering the weak skills and their missing prerequisites"""
+    names = {}
+    for skill in weak_skills:
+        names.setdefault(skill_key(skill), skill.strip())
+    weak = tuple(sorted(names))
+    known = tuple(sorted({skill_key(skill) for skill in known_skills} - set(weak)))
+    modules = _cached_path(weak, known, tuple(names[key] for key in weak))
+    return [dict(module, order=i + 1) for i, module in enumerate(modules)]
+
+
+def learning_path_stats() -> Dict:
+    info = _cached_path.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+def dashboard_modules(learning_path: List[Dict]) -> List[Dict]:
+    """Learning path modules with the per-user progress fields the dashboard renders"""
+    return [dict(module, status="Not Started", progress=0) for module in learning_path]
@@ -0,0 +1,191 @@
+"""
+LLM Circuit Breaker and Deadline Budgets
+Stops slow or failing Cohere calls from dragging every request down with them
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# Breaker tuning (override through environment variables)
+LLM_FAILURE_THRESHOLD = int(os.getenv("LLM_FAILURE_THRESHOLD", "3"))
+LLM_SLOW_CALL_SECONDS = float(os.getenv("LLM_SLOW_CALL_SECONDS", "10"))
+LLM_RECOVERY_SECONDS = float(os.getenv("LLM_RECOVERY_SECONDS", "30"))
+# A half-open probe that has not reported back by then is presumed lost and another is allowed
+LLM_PROBE_TIMEOUT_SECONDS = float(os.getenv("LLM_PROBE_TIMEOUT_SECONDS", "60"))
+
+# Recent calls kept for latency and error-rate reporting
+LLM_RECENT_CALLS = int(os.getenv("LLM_RECENT_CALLS", "200"))
+LLM_RECENT_WINDOW_SECONDS = float(os.getenv("LLM_RECENT_WINDOW_SECONDS", "300"))
+
+# Deadline tuning: default request budget and the minimum needed to try the LLM
+DEFAULT_REQUEST_BUDGET_SECONDS = float(os.getenv("REQUEST_BUDGET_SECONDS", "25"))
+LLM_MIN_BUDGET_SECONDS = float(os.getenv("LLM_MIN_BUDGET_SECONDS", "4"))
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = LLM_FAILURE_THRESHOLD,
+        slow_call_seconds: float = LLM_SLOW_CALL_SECONDS,
+        recovery_seconds: float = LLM_RECOVERY_SECONDS,
+        probe_timeout_seconds: float = LLM_PROBE_TIMEOUT_SECONDS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.recovery_seconds = recovery_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started_at = 0.0
+        self._total_calls = 0
+        self._total_failures = 0
+        self._rejected = 0
+        # (finished at, duration, failed) for the most recent calls
+        self._recent = deque(maxlen=LLM_RECENT_CALLS)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self):
+        if self._state == self.OPEN and time.time() - self._opened_at >= self.recovery_seconds:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Return True if a call may go through (claims the probe when half-open)"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and (
+                not self._probe_in_flight
+                or time.time() - self._probe_started_at >= self.probe_timeout_seconds
+            ):
+                self._probe_in_flight = True
+                self._probe_started_at = time.time()
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self, duration: float):
+        """Record a finished call; slow successes count as failures"""
+        if duration >= self.slow_call_seconds:
+            self.record_failure(duration)
+            return
+        with self._lock:
+            self._recent.append((time.time(), duration, False))
+            self._total_calls += 1
+            self._consecutive_failures = 0
+            if self._state != self.CLOSED:
+                print(f"✅ Circuit '{self.name}' closed - LLM recovered")
+            self._state = self.CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self, duration: Optional[float] = None):
+        """Record a failed (or too slow) call and trip the breaker if needed"""
+        with self._lock:
+            self._recent.append((time.time(), duration, True))
+            self._total_calls += 1
+            self._total_failures += 1
+            self._consecutive_failures += 1
+            tripped = (
+                self._state == self.HALF_OPEN
+                or self._consecutive_failures >= self.failure_threshold
+            )
+            if tripped and self._state != self.OPEN:
+                print(f"⛔ Circuit '{self.name}' opened after {self._consecutive_failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.time()
+            self._probe_in_flight = False
+
+    def record_abandoned(self):
+        """The caller gave up before the call produced a result; free the half-open probe"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def call(self, func, *args, **kwargs):
+        """Run func through the breaker, raising CircuitOpenError when open"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        start = time.time()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure(time.time() - start)
+            raise
+        self.record_success(time.time() - start)
+        return result
+
+    def stats(self) -> Dict:
+        """Return breaker state and counters"""
+        with self._lock:
+            self._maybe_half_open()
+            return {
+                "name": self.name,
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "total_calls": self._total_calls,
+                "total_failures": self._total_failures,
+                "rejected_calls": self._rejected,
+            }
+
+    def recent(self) -> Dict:
+        """Latency and error rate of the calls finished in the last LLM_RECENT_WINDOW_SECONDS"""
+        cutoff = time.time() - LLM_RECENT_WINDOW_SECONDS
+        with self._lock:
+            calls = [call for call in self._recent if call[0] >= cutoff]
+        durations = sorted(duration for _, duration, _ in calls if duration is not None)
+        failures = sum(1 for _, _, failed in calls if failed)
+        return {
+            "window_seconds": LLM_RECENT_WINDOW_SECONDS,
+            "calls": len(calls),
+            "error_rate": round(failures / len(calls), 3) if calls else None,
+            "avg_latency_ms": round(sum(durations) / len(durations) * 1000) if durations else None,
+            "p95_latency_ms": round(durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000) if durations else None
+        }
+
+
+class Deadline:
+    """Per-request time budget"""
+
+    def __init__(self, budget_seconds: Optional[float] = None):
+        if budget_seconds is None:
+            budget_seconds = DEFAULT_REQUEST_BUDGET_SECONDS
+        self.budget_seconds = budget_seconds
+        self.expires_at = time.time() + budget_seconds
+
+    def remaining(self) -> float:
+        """Seconds left in the budget (never negative)"""
+        return max(0.0, self.expires_at - time.time())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def allows_llm(self) -> bool:
+        """True if there is enough budget left to be worth calling the LLM"""
+        return self.remaining() >= LLM_MIN_BUDGET_SECONDS
+
+
+# Shared breaker for every Cohere call in this process
+cohere_breaker = CircuitBreaker("cohere")
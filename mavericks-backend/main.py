@@ -1,36 +1,102 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from startup_timing import startup_timer, FirstRequestTimer
+startup_timer.install()
+
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, BackgroundTasks, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 import os
 from dotenv import load_dotenv
-import PyPDF2
 import io
+import math
 import json
-import re
-import cohere
 import uuid
 import time
 import shutil
-from typing import List, Dict, Optional
+import threading
+import hashlib
+import hmac
+import heapq
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from pydantic import BaseModel
 from assessment_cache import (
     get_cached_assessment, 
     cache_assessment, 
     get_predefined_assessment,
-    get_video_recommendations
+    get_encoded_assessment,
+    assessment_cache_stats,
+    encode_json
+)
+from llm_guard import cohere_breaker, CircuitOpenError, Deadline
+from rate_limiter import rate_limiter, llm_admission, OverloadedError, LLM_DRAIN_SECONDS, IP_LIMIT_MULTIPLIER
+from stream_parser import IncrementalQuestionParser, parse_questions_lenient
+from question_bank import question_bank
+from static_bundles import (
+    ImmutableStaticFiles,
+    STATIC_BUNDLES_DIR,
+    STATIC_BUNDLES_URL,
+    export_static_bundles,
+    load_bundle_assessments
 )
+from question_registry import StoredAssessment
+from shared_cache import open_shared_cache
+from dashboard_store import dashboard_store
+from leaderboard import leaderboards
+from score_analytics import score_analytics
+from recommendation_index import get_video_recommendations
+from skill_matcher import skill_matcher, display_name
+from skill_catalog import skill_catalog
+from resume_index import resume_index, minhash
+from skill_graph import skill_graph
+from learning_path import build_learning_path, dashboard_modules, learning_path_stats
+from event_store import event_store
+from readiness import event_loop_monitor, readiness_report
+from analysis_engine import BoundedTTLCache, compute_skill_scores, outcome_signature, analysis_cache, narrative_cache
 
 # Load .env
 load_dotenv()
 
-# Configure Cohere AI
+# Configure Cohere AI - the SDK is imported and the client created on first use,
+# which keeps worker spawn and test startup fast
 cohere_key = os.getenv("COHERE_API_KEY")
-if cohere_key:
-    cohere_client = cohere.Client(cohere_key)
-    print("✅ Cohere AI configured successfully")
-else:
+if not cohere_key:
     print("⚠️ No Cohere API key found - assessment features will be limited")
-    cohere_client = None
+_cohere_client = None
+_cohere_client_lock = threading.Lock()
+
+def get_cohere_client():
+    """Cohere client, created on first use; None when no API key is configured"""
+    global _cohere_client
+    if _cohere_client is None and cohere_key:
+        with _cohere_client_lock:
+            if _cohere_client is None:
+                with startup_timer.measure("cohere"):
+                    import cohere
+                    _cohere_client = cohere.Client(cohere_key)
+                print("✅ Cohere AI configured successfully")
+    return _cohere_client
+
+def preload_heavy_dependencies():
+    """Import the lazily loaded SDKs now (the production launcher does this before forking)"""
+    with startup_timer.measure("PyPDF2"):
+        import PyPDF2  # noqa: F401
+    if cohere_key:
+        with startup_timer.measure("cohere"):
+            import cohere  # noqa: F401
+
+# Token budget for AI generation: every prompt batch must fit its questions in MAX_GENERATION_TOKENS
+MAX_GENERATION_TOKENS = 1000
+QUESTIONS_PER_SKILL = 2
+SINGLE_SKILL_QUESTIONS = 5
+TOKENS_PER_QUESTION = 110
+RESPONSE_OVERHEAD_TOKENS = 80
+MAX_PARALLEL_BATCHES = int(os.getenv("MAX_PARALLEL_BATCHES", "4"))
+
+# Question bank buckets currently being refilled in the background
+bank_refills_in_flight = set()
 
 # Init FastAPI
 app = FastAPI(title="Resume Skill Extractor & Assessment System", version="2.0.0")
@@ -43,15 +109,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Records time to the first response for the startup report
+app.add_middleware(FirstRequestTimer, timer=startup_timer)
+
+@app.on_event("startup")
+def begin_startup_timing():
+    startup_timer.startup_begin()
+
+@app.on_event("startup")
+async def start_event_loop_monitor():
+    event_loop_monitor.start()
+
+@app.on_event("shutdown")
+def stop_event_loop_monitor():
+    event_loop_monitor.stop()
+
 # Pydantic models for request/response
 class AssessmentRequest(BaseModel):
     skills: List[str]
     difficulty: str = "intermediate"  # beginner, intermediate, advanced
+    deadline_ms: Optional[int] = None  # time budget for this request
 
 class AssessmentSubmission(BaseModel):
     assessment_id: str
     answers: Dict[str, str]
     time_taken: int  # in minutes
+    user_id: Optional[str] = None  # falls back to the X-User-Id header; must match X-User-Token when one is sent
 
 class AssessmentResult(BaseModel):
     assessment_id: str
@@ -59,10 +142,92 @@ class AssessmentResult(BaseModel):
     weak_skills: List[str]
     recommendations: List[Dict[str, str]]
 
+def request_deadline(request: AssessmentRequest) -> Deadline:
+    """Build the time budget for an assessment request"""
+    if request.deadline_ms is not None:
+        return Deadline(request.deadline_ms / 1000)
+    return Deadline()
+
+def call_cohere(method, **kwargs):
+    """Call a Cohere client method through the LLM admission limiter and the circuit breaker"""
+    with llm_admission.slot():
+        return cohere_breaker.call(method, **kwargs)
+
+def client_keys(request: Request) -> List[Tuple[str, float]]:
+    """Rate limit buckets for the caller as (key, limit multiplier): always the client IP, plus
+    the X-User-Id header as a stricter extra bucket (the header is unauthenticated, so it never
+    replaces the IP bucket)"""
+    keys = [(f"ip:{request.client.host if request.client else 'unknown'}", IP_LIMIT_MULTIPLIER)]
+    user_id = request.headers.get("x-user-id")
+    if user_id:
+        keys.append((f"user:{user_id}", 1.0))
+    return keys
+
+def too_many_requests(retry_after: float, detail: str) -> HTTPException:
+    """429 response telling the client when to retry"""
+    return HTTPException(status_code=429, detail=detail, headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
+
+def rate_limited(endpoint: str):
+    """Dependency enforcing the per-client token bucket for an endpoint"""
+    def check_rate_limit(request: Request):
+        retry_after = rate_limiter.check_all(client_keys(request), endpoint)
+        if retry_after:
+            raise too_many_requests(retry_after, "Rate limit exceeded, please slow down")
+    return check_rate_limit
+
+# Shared secret for admin-only endpoints (sent as X-Admin-Token); unset disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+def require_admin(request: Request):
+    """Dependency rejecting callers without the admin token"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (set ADMIN_TOKEN)")
+    if not hmac.compare_digest(request.headers.get("x-admin-token", ""), ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+# Signed user identities: X-User-Token is "<user_id>.<hex HMAC-SHA256 of user_id>" under
+# USER_TOKEN_SECRET, minted by whatever authenticates users in front of this API
+USER_TOKEN_SECRET = os.getenv("USER_TOKEN_SECRET", "")
+
+def sign_user_id(user_id: str) -> str:
+    """The X-User-Token value for a user"""
+    signature = hmac.new(USER_TOKEN_SECRET.encode("utf-8"), user_id.encode("utf-8"), hashlib.sha256).hexdigest()
+    return f"{user_id}.{signature}"
+
+def verified_user_id(request: Request) -> Optional[str]:
+    """The user named by a valid X-User-Token header, if any"""
+    token = request.headers.get("x-user-token", "")
+    user_id, _, _ = token.rpartition(".")
+    if not USER_TOKEN_SECRET or not user_id or not hmac.compare_digest(token, sign_user_id(user_id)):
+        return None
+    return user_id
+
+def resolve_user_id(request: Request, claimed: Optional[str]) -> Optional[str]:
+    """The user an event is recorded for: the token's user once USER_TOKEN_SECRET is set,
+    otherwise the unauthenticated user_id field or X-User-Id header"""
+    claimed = claimed or request.headers.get("x-user-id")
+    if not USER_TOKEN_SECRET:
+        return claimed
+    user_id = verified_user_id(request)
+    if claimed and claimed != user_id:
+        raise HTTPException(status_code=403, detail="user_id does not match X-User-Token")
+    return user_id
+
+def require_user(user_id: str, request: Request):
+    """Dependency letting only the user named in the path read their own data"""
+    if not USER_TOKEN_SECRET:
+        raise HTTPException(status_code=403, detail="User endpoints are disabled (set USER_TOKEN_SECRET)")
+    caller = verified_user_id(request)
+    if caller is None:
+        raise HTTPException(status_code=401, detail="Valid X-User-Token required")
+    if caller != user_id:
+        raise HTTPException(status_code=403, detail="Not allowed to read another user's data")
+
 def extract_text_from_pdf(pdf_content):
     """Extract text from PDF content"""
     try:
         pdf_file = io.BytesIO(pdf_content)
+        import PyPDF2
         pdf_reader = PyPDF2.PdfReader(pdf_file)
         text = ""
         for page in pdf_reader.pages:
@@ -84,72 +249,8 @@ def extract_skills_locally(text):
     """Extract skills using local pattern matching"""
     print("🔧 Using local skill extraction")
     
-    # Common technical skills patterns
-    skill_patterns = {
-        'programming_languages': [
-            'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift',
-            'kotlin', 'typescript', 'scala', 'r', 'matlab', 'perl', 'shell', 'bash', 'powershell',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server'
-        ],
-        'web_technologies': [
-            'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask',
-            'spring', 'laravel', 'bootstrap', 'jquery', 'sass', 'less', 'webpack', 'babel',
-            'reactjs', 'react.js', 'nodejs', 'node.js'
-        ],
-        'databases': [
-            'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite', 'oracle', 'sql server',
-            'elasticsearch', 'cassandra', 'dynamodb', 'firebase', 'sql'
-        ],
-        'cloud_devops': [
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'github', 'gitlab',
-            'terraform', 'ansible', 'chef', 'puppet', 'nagios', 'prometheus', 'grafana'
-        ],
-        'data_ai': [
-            'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn',
-            'pandas', 'numpy', 'matplotlib', 'seaborn', 'jupyter', 'tableau', 'power bi'
-        ],
-        'mobile': [
-            'android', 'ios', 'react native', 'flutter', 'xamarin', 'cordova', 'ionic'
-        ]
-    }
-    
-    found_skills = set()
-    text_lower = text.lower()
-    
-    # Search for skills in text
-    for category, skills in skill_patterns.items():
-        for skill in skills:
-            # Use word boundaries to avoid partial matches
-            # Handle special characters properly
-            skill_lower = skill.lower()
-            if skill_lower in ['c++', 'c#']:
-                pattern = r'\b' + re.escape(skill_lower) + r'\b'
-            else:
-                pattern = r'\b' + re.escape(skill_lower) + r'\b'
-            if re.search(pattern, text_lower):
-                # Capitalize properly
-                if skill.lower() in ['c++', 'c#']:
-                    found_skills.add(skill.upper())
-                elif skill.lower() == 'node.js':
-                    found_skills.add('Node.js')
-                elif skill.lower() == 'machine learning':
-                    found_skills.add('Machine Learning')
-                elif skill.lower() == 'deep learning':
-                    found_skills.add('Deep Learning')
-                elif skill.lower() == 'sql':
-                    found_skills.add('SQL')
-                elif skill.lower() == 'javascript':
-                    found_skills.add('JavaScript')
-                elif skill.lower() == 'react':
-                    found_skills.add('React')
-                elif skill.lower() == 'reactjs':
-                    found_skills.add('React')
-                elif skill.lower() == 'react.js':
-                    found_skills.add('React')
-                elif skill.lower() == 'nodejs':
-                    found_skills.add('Node.js')
-                else:
-                    found_skills.add(skill.title())
+    # Exact, alias and fuzzy matches against the taxonomy in a single pass over the tokens
+    found_skills = {display_name(term) for term in skill_matcher.match(text)}
     
     # Convert to sorted list
     skills_list = sorted(list(found_skills))
@@ -159,20 +260,63 @@ def extract_skills_locally(text):
     
     return skills_list
 
-def generate_assessment_with_cohere(skills: List[str], difficulty: str = "intermediate") -> Dict:
+def build_assessment_prompt(skills: List[str], difficulty: str) -> str:
+    """Build the Cohere prompt for an assessment covering the given skills"""
+    return f"""
+    Create a comprehensive technical assessment for the following skills: {', '.join(skills)}
+    Difficulty level: {difficulty}
+    
+    Generate a SINGLE assessment with EXACTLY {QUESTIONS_PER_SKILL} questions per skill (total of {len(skills)*QUESTIONS_PER_SKILL} questions) with the following format:
+    {{
+        "assessment_id": "unique_id_here",
+        "title": "Comprehensive Technical Skills Assessment",
+        "difficulty": "{difficulty}",
+        "skills_tested": {skills},
+        "questions": [
+            {{
+                "id": "q1",
+                "skill": "skill_name",
+                "question": "Question text here?",
+                "options": ["A", "B", "C", "D"],
+                "correct_answer": "A",
+                "explanation": "Why this is correct"
+            }}
+        ]
+    }}
+    
+    IMPORTANT REQUIREMENTS:
+    1. Create EXACTLY {QUESTIONS_PER_SKILL} questions for EACH skill in the skills list
+    2. Make questions practical and relevant to real-world scenarios
+    3. Ensure questions test different aspects of each skill (basic and advanced)
+    4. Include a mix of difficulty levels to properly assess skill proficiency
+    5. The assessment must be able to categorize skills as STRONG (score >= 80%), AVERAGE (score 50-79%), or WEAK (score < 50%)
+    
+    Return ONLY the JSON, no additional text.
+    """
+
+def generate_assessment_with_cohere(skills: List[str], difficulty: str = "intermediate", deadline: Optional[Deadline] = None) -> Dict:
     """Generate assessment using optimized approach (cache + predefined + AI fallback)"""
+    if deadline is None:
+        deadline = Deadline()
     
     # For single skill assessments, try optimized approaches first
     if len(skills) == 1:
         skill = skills[0]
         
-        # 1. Check cache first (fastest)
+        # 1. Sample a fresh quiz from the question bank when it holds enough questions
+        if question_bank.count(skill) >= SINGLE_SKILL_QUESTIONS:
+            print(f"🎲 Sampling assessment for {skill} from the question bank")
+            banked = question_bank.sample(skill, difficulty, SINGLE_SKILL_QUESTIONS)
+            schedule_bank_refill(skill, difficulty)
+            return compose_assessment(skills, difficulty, {skill: banked}, "question_bank")
+        
+        # 2. Check cache (fast)
         cached = get_cached_assessment(skill, difficulty)
         if cached:
             print(f"⚡ Using cached assessment for {skill}")
             return cached
         
-        # 2. Try predefined assessment (fast)
+        # 3. Try predefined assessment (fast)
         predefined = get_predefined_assessment(skill)
         if predefined:
             print(f"📚 Using predefined assessment for {skill}")
@@ -189,84 +333,304 @@ def generate_assessment_with_cohere(skills: List[str], difficulty: str = "interm
             cache_assessment(skill, difficulty, assessment_data)
             return assessment_data
     
-    # 3. Fallback to AI generation (slower but more flexible)
-    if not cohere_client:
+    # 4. Multi-skill: reuse per-skill banked, cached or predefined components where available
+    reused = {}
+    if len(skills) > 1:
+        for skill in skills:
+            component = get_component_questions(skill, difficulty)
+            if component:
+                reused[skill] = component[:QUESTIONS_PER_SKILL]
+    missing = [skill for skill in skills if skill not in reused]
+    if not missing:
+        print(f"⚡ Composed assessment for {len(skills)} skills from cached components")
+        return compose_assessment(skills, difficulty, reused, "composed")
+    
+    # 5. Fallback to AI generation (slower but more flexible) for the missing skills only
+    if not cohere_key:
         raise Exception("Cohere AI is required for assessment generation. Please configure a valid API key.")
     
+    batches = split_skill_batches(missing)
+    # Skip the LLM when the request has no time left for it
+    if not deadline.allows_llm():
+        print(f"⏱️ Only {deadline.remaining():.1f}s left - using structured questions")
+        results = [(create_structured_assessment(batch, difficulty, f"Assessment for {', '.join(batch)}")["questions"], False, True) for batch in batches]
+    elif len(batches) == 1:
+        print(f"🤖 Generating AI questions for {len(missing)} skills...")
+        results = [generate_question_batch(batches[0], difficulty, deadline)]
+    else:
+        # Batches are independent prompts, so run them concurrently
+        print(f"🤖 Generating AI questions for {len(missing)} skills in {len(batches)} batches...")
+        with ThreadPoolExecutor(max_workers=min(len(batches), MAX_PARALLEL_BATCHES)) as pool:
+            results = list(pool.map(lambda batch: generate_question_batch(batch, difficulty, deadline), batches))
+    
+    generated = {}
+    for batch, (batch_questions, ai_ok, complete) in zip(batches, results):
+        grouped = group_questions_by_skill(batch, batch_questions)
+        generated.update(grouped)
+        if not ai_ok:
+            continue
+        # Bank and cache each generated skill on its own so later assessments can reuse it;
+        # questions salvaged from a truncated response are banked but never cached as a full assessment
+        for skill, skill_questions in grouped.items():
+            if skill_questions:
+                question_bank.add_questions(skill, difficulty, skill_questions)
+                if complete:
+                    cache_assessment(skill, difficulty, compose_assessment([skill], difficulty, {skill: skill_questions}, "ai_generated"))
+    
+    if reused:
+        source = "composed"
+    elif any(ai_ok for _, ai_ok, _ in results):
+        source = "ai_generated"
+    else:
+        source = "structured"
+    
+    # Merge in skill order so question ids stay stable (q1..qN follow the skill order)
+    assessment_data = compose_assessment(skills, difficulty, {**reused, **generated}, source)
+    print(f"✅ Generated assessment for {len(skills)} skills ({len(missing)} generated, {len(reused)} reused)")
+    return assessment_data
+
+def get_component_questions(skill: str, difficulty: str) -> Optional[List[Dict]]:
+    """Return questions for one skill from the question bank, cache or predefined set, if available"""
+    if question_bank.count(skill) >= QUESTIONS_PER_SKILL:
+        schedule_bank_refill(skill, difficulty)
+        return question_bank.sample(skill, difficulty, QUESTIONS_PER_SKILL)
+    cached = get_cached_assessment(skill, difficulty)
+    if cached:
+        return cached["questions"]
+    predefined = get_predefined_assessment(skill)
+    if predefined:
+        return predefined["questions"]
+    return None
+
+def schedule_bank_refill(skill: str, difficulty: str):
+    """Top up a low question bank bucket in the background so later quizzes get variety"""
+    key = (skill.lower(), difficulty)
+    if not cohere_key or key in bank_refills_in_flight or not question_bank.is_low(skill, difficulty):
+        return
+    bank_refills_in_flight.add(key)
+    
+    def refill():
+        try:
+            questions, ai_ok, _ = generate_question_batch([skill], difficulty, Deadline())
+            if ai_ok:
+                added = question_bank.add_questions(skill, difficulty, questions)
+                print(f"📦 Added {added} new {skill} questions to the question bank")
+        except OverloadedError:
+            print(f"⏳ LLM busy - skipped question bank refill for {skill}")
+        finally:
+            bank_refills_in_flight.discard(key)
+    
+    threading.Thread(target=refill, daemon=True).start()
+
+def group_questions_by_skill(skills: List[str], questions: List[Dict]) -> Dict[str, List[Dict]]:
+    """Assign generated questions to the skills of their batch"""
+    grouped = {skill: [] for skill in skills}
+    lookup = {skill.lower(): skill for skill in skills}
+    for i, question in enumerate(questions):
+        skill = lookup.get(str(question.get("skill", "")).lower())
+        if skill is None:
+            # Unrecognised skill label: questions come in skill order, so attribute by position
+            skill = skills[min(i // QUESTIONS_PER_SKILL, len(skills) - 1)]
+        grouped[skill].append(question)
+    return grouped
+
+def compose_assessment(skills: List[str], difficulty: str, components: Dict[str, List[Dict]], source: str) -> Dict:
+    """Assemble one assessment from per-skill question lists, numbering questions q1..qN"""
+    questions = []
+    for skill in skills:
+        for question in components.get(skill, []):
+            # Copy so shared cached/predefined questions are never renumbered in place
+            questions.append(dict(question, id=f"q{len(questions)+1}"))
+    return {
+        "assessment_id": str(uuid.uuid4()),
+        "title": f"{skills[0]} Skills Assessment" if len(skills) == 1 else "Comprehensive Technical Skills Assessment",
+        "difficulty": difficulty,
+        "skills_tested": skills,
+        "questions": questions,
+        "created_at": int(time.time()),
+        "source": source
+    }
+
+def split_skill_batches(skills: List[str]) -> List[List[str]]:
+    """Split skills into prompt batches whose questions fit in the generation token budget"""
+    per_batch = max(1, (MAX_GENERATION_TOKENS - RESPONSE_OVERHEAD_TOKENS) // (QUESTIONS_PER_SKILL * TOKENS_PER_QUESTION))
+    return [skills[i:i + per_batch] for i in range(0, len(skills), per_batch)]
+
+def generate_question_batch(skills: List[str], difficulty: str, deadline: Deadline):
+    """Generate questions for one batch of skills; returns (questions, generated_by_ai, complete)"""
     try:
-        print(f"🤖 Generating AI assessment for {len(skills)} skills...")
-        prompt = f"""
-        Create a comprehensive technical assessment for the following skills: {', '.join(skills)}
-        Difficulty level: {difficulty}
-        
-        Generate a SINGLE assessment with EXACTLY 2 questions per skill (total of {len(skills)*2} questions) with the following format:
-        {{
-            "assessment_id": "unique_id_here",
-            "title": "Comprehensive Technical Skills Assessment",
-            "difficulty": "{difficulty}",
-            "skills_tested": {skills},
-            "questions": [
-                {{
-                    "id": "q1",
-                    "skill": "skill_name",
-                    "question": "Question text here?",
-                    "options": ["A", "B", "C", "D"],
-                    "correct_answer": "A",
-                    "explanation": "Why this is correct"
-                }}
-            ]
-        }}
-        
-        IMPORTANT REQUIREMENTS:
-        1. Create EXACTLY 2 questions for EACH skill in the skills list
-        2. Make questions practical and relevant to real-world scenarios
-        3. Ensure questions test different aspects of each skill (basic and advanced)
-        4. Include a mix of difficulty levels to properly assess skill proficiency
-        5. The assessment must be able to categorize skills as STRONG (score >= 80%), AVERAGE (score 50-79%), or WEAK (score < 50%)
-        
-        Return ONLY the JSON, no additional text.
-        """
-        
-        response = cohere_client.generate(
+        response = call_cohere(
+            get_cohere_client().generate,
             model="command",
-            prompt=prompt,
-            max_tokens=1000,
-            temperature=0.7
+            prompt=build_assessment_prompt(skills, difficulty),
+            max_tokens=MAX_GENERATION_TOKENS,
+            temperature=0.7,
+            request_options={"timeout_in_seconds": max(1, int(deadline.remaining()))}
         )
         
         # Parse the response
         assessment_text = response.generations[0].text.strip()
         
-        # Try to extract JSON from the response
-        try:
-            # Find JSON in the response
-            start_idx = assessment_text.find('{')
-            end_idx = assessment_text.rfind('}') + 1
-            if start_idx != -1 and end_idx != 0:
-                json_str = assessment_text[start_idx:end_idx]
-                assessment_data = json.loads(json_str)
-            else:
-                raise Exception("No JSON found in response")
-        except json.JSONDecodeError:
-            # If JSON parsing fails, create a structured response
-            print(f"⚠️ JSON parsing failed, creating structured assessment from: {assessment_text[:100]}...")
-            assessment_data = create_structured_assessment(skills, difficulty, assessment_text)
-        
-        # Add timestamp and source
-        assessment_data["created_at"] = int(time.time())
-        assessment_data["source"] = "ai_generated"
-        
-        # Cache AI-generated assessments
-        if len(skills) == 1:
-            cache_assessment(skills[0], difficulty, assessment_data)
-        
-        print(f"✅ Generated AI assessment for {len(skills)} skills")
-        return assessment_data
+        # Find JSON in the response
+        questions = []
+        complete = True
+        start_idx = assessment_text.find('{')
+        end_idx = assessment_text.rfind('}') + 1
+        if start_idx != -1 and end_idx != 0:
+            try:
+                parsed = json.loads(assessment_text[start_idx:end_idx])
+                questions = parsed.get("questions", []) if isinstance(parsed, dict) else []
+            except json.JSONDecodeError:
+                # Keep every complete question from a truncated response before giving up
+                questions = parse_questions_lenient(assessment_text)
+                complete = False
+                if questions:
+                    print(f"⚠️ Truncated JSON, kept {len(questions)} complete questions for {', '.join(skills)}")
         
+        if questions:
+            return questions, True, complete
+        print(f"⚠️ JSON parsing failed, creating structured questions from: {assessment_text[:100]}...")
+    except OverloadedError:
+        # Let the endpoint shed the request with a 429
+        raise
+    except CircuitOpenError:
+        print(f"⛔ Cohere circuit open - using structured questions for {', '.join(skills)}")
     except Exception as e:
-        print(f"❌ Error generating assessment: {e}")
-        # Fallback to structured assessment
-        return create_structured_assessment(skills, difficulty, f"Assessment for {', '.join(skills)}")
+        print(f"❌ Error generating questions for {', '.join(skills)}: {e}")
+    
+    # Fallback to structured questions for this batch only
+    fallback = create_structured_assessment(skills, difficulty, f"Assessment for {', '.join(skills)}")
+    return fallback["questions"], False, True
+
+def acquire_stream_slot() -> bool:
+    """Claim an LLM admission slot and a circuit breaker pass for a streamed generation"""
+    try:
+        llm_admission.acquire()
+    except OverloadedError:
+        print("⏳ LLM busy - not streaming from Cohere")
+        return False
+    if not cohere_breaker.allow_request():
+        llm_admission.release()
+        return False
+    return True
+
+def emit_question(live: Dict, question: Dict) -> Dict:
+    """Append a copy of a question to the live assessment, numbered in arrival order, and wrap it as an event"""
+    question = dict(question, id=f"q{len(live['questions'])+1}")
+    live["questions"].append(question)
+    return {"type": "question", "question": question}
+
+def stream_question_batch(skills: List[str], difficulty: str, deadline: Deadline, live: Dict):
+    """Stream questions for one batch of skills into the live assessment; returns (questions, generated_by_ai, complete)"""
+    questions = []
+    complete = True
+    if not cohere_key or not deadline.allows_llm() or not acquire_stream_slot():
+        print(f"⛔ Skipping streamed LLM generation - using structured questions for {', '.join(skills)}")
+    else:
+        # The admission slot and breaker pass are held from here on: every exit path,
+        # including the client disconnecting mid-stream (GeneratorExit), must give them back
+        parser = IncrementalQuestionParser()
+        start = time.time()
+        first_question_at = None
+        outcome_recorded = False
+        try:
+            print(f"🤖 Streaming AI questions for {len(skills)} skills...")
+            events = get_cohere_client().generate_stream(
+                model="command",
+                prompt=build_assessment_prompt(skills, difficulty),
+                max_tokens=MAX_GENERATION_TOKENS,
+                temperature=0.7,
+                request_options={"timeout_in_seconds": max(1, int(deadline.remaining()))}
+            )
+            for event in events:
+                text = getattr(event, "text", None)
+                if not text:
+                    continue
+                for question in parser.feed(text):
+                    questions.append(question)
+                    if first_question_at is None:
+                        first_question_at = time.time() - start
+                        print(f"⚡ First streamed question after {first_question_at:.2f}s")
+                    yield emit_question(live, question)
+            cohere_breaker.record_success(time.time() - start)
+            outcome_recorded = True
+            complete = parser.finished
+        except Exception as e:
+            print(f"❌ Error streaming questions for {', '.join(skills)}: {e}")
+            cohere_breaker.record_failure(time.time() - start)
+            outcome_recorded = True
+            complete = False
+        finally:
+            if not outcome_recorded:
+                # Client went away: questions already streamed show the LLM was answering
+                if first_question_at is not None:
+                    cohere_breaker.record_success(time.time() - start)
+                else:
+                    cohere_breaker.record_abandoned()
+            llm_admission.release()
+    
+    if questions:
+        return questions, True, complete
+    
+    # Nothing usable arrived - fall back to structured questions for this batch only
+    questions = create_structured_assessment(skills, difficulty, f"Assessment for {', '.join(skills)}")["questions"]
+    for question in questions:
+        yield emit_question(live, question)
+    return questions, False, True
+
+def stream_assessment_with_cohere(skills: List[str], difficulty: str = "intermediate", deadline: Optional[Deadline] = None):
+    """Yield assessment events, emitting each question as soon as the LLM finishes it"""
+    if deadline is None:
+        deadline = Deadline()
+    start = time.time()
+    
+    # Banked, cached and predefined assessments are already complete - replay them
+    if all(get_component_questions(skill, difficulty) for skill in skills):
+        instant = generate_assessment_with_cohere(skills, difficulty, deadline)
+        live = dict(instant, questions=[])
+        yield {"type": "assessment", "assessment": live}
+        for question in instant["questions"]:
+            live["questions"].append(question)
+            yield {"type": "question", "question": question}
+        yield {"type": "done", "assessment_id": live["assessment_id"], "question_count": len(live["questions"]), "truncated": False}
+        return
+    
+    # Multi-skill: reuse per-skill components and stream only the missing skills,
+    # batched like generate_assessment_with_cohere so each prompt fits the token budget
+    reused = {}
+    if len(skills) > 1:
+        for skill in skills:
+            component = get_component_questions(skill, difficulty)
+            if component:
+                reused[skill] = component[:QUESTIONS_PER_SKILL]
+    missing = [skill for skill in skills if skill not in reused]
+    
+    live = compose_assessment(skills, difficulty, {}, "composed" if reused else "ai_generated")
+    yield {"type": "assessment", "assessment": live}
+    for skill in skills:
+        for question in reused.get(skill, []):
+            yield emit_question(live, question)
+    
+    truncated = False
+    ai_used = False
+    for batch in split_skill_batches(missing):
+        batch_questions, ai_ok, complete = yield from stream_question_batch(batch, difficulty, deadline, live)
+        truncated = truncated or not complete
+        if not ai_ok:
+            continue
+        ai_used = True
+        # Complete questions are worth banking even if the tail of the stream was cut off,
+        # but only a complete response is cached as a full assessment
+        for skill, skill_questions in group_questions_by_skill(batch, batch_questions).items():
+            if skill_questions:
+                question_bank.add_questions(skill, difficulty, skill_questions)
+                if complete:
+                    cache_assessment(skill, difficulty, compose_assessment([skill], difficulty, {skill: skill_questions}, "ai_generated"))
+    
+    if not reused and not ai_used:
+        live["source"] = "structured"
+    print(f"✅ Streamed {len(live['questions'])} questions in {time.time() - start:.2f}s")
+    yield {"type": "done", "assessment_id": live["assessment_id"], "question_count": len(live["questions"]), "truncated": truncated}
 
 def create_structured_assessment(skills: List[str], difficulty: str, response_text: str) -> Dict:
     """Create structured assessment from Cohere response"""
@@ -347,118 +711,172 @@ def create_structured_assessment(skills: List[str], difficulty: str, response_te
         "questions": questions
     }
 
-def analyze_assessment_results(assessment_id: str, answers: Dict[str, str], skills: List[str]) -> Dict:
-    """Analyze assessment results and identify weak skills using Cohere"""
-    if not cohere_client:
-        raise Exception("Cohere AI is required for assessment analysis. Please configure a valid API key.")
+def analyze_assessment_results(assessment_id: str, answers: Dict[str, str], skills: List[str], questions: List[Dict], difficulty: str = "intermediate") -> Dict:
+    """Analyze assessment results locally: per-skill scores, levels and curated videos"""
+    # Calculate basic score
+    total_questions = len(answers)
+    correct_answers = sum(1 for answer in answers.values() if answer == "correct")
+    score = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
     
-    try:
-        # Calculate basic score
-        total_questions = len(answers)
-        correct_answers = sum(1 for answer in answers.values() if answer == "correct")
-        score = (correct_answers / total_questions) * 100 if total_questions > 0 else 0
-        
-        # Generate analysis prompt
-        prompt = f"""
-        Analyze the assessment results:
-        - Skills tested: {', '.join(skills)}
-        - Score: {score}%
-        - Total questions: {total_questions}
-        - Correct answers: {correct_answers}
-        
-        Identify weak skills and provide video recommendations. Return JSON format:
-        {{
-            "assessment_id": "{assessment_id}",
-            "score": {score},
-            "weak_skills": ["skill1", "skill2"],
-            "recommendations": [
-                {{
-                    "skill": "skill_name",
-                    "video_title": "Video Title",
-                    "video_url": "https://youtube.com/watch?v=...",
-                    "description": "Why this video is recommended"
-                }}
-            ],
-            "improvement_plan": "Personalized improvement suggestions"
-        }}
-        
-        Focus on skills where the user scored poorly or showed gaps. Return ONLY the JSON, no additional text.
-        """
-        
-        response = cohere_client.generate(
-            model="command",
-            prompt=prompt,
-            max_tokens=800,
-            temperature=0.5
-        )
-        
-        # Parse the response
-        analysis_text = response.generations[0].text.strip()
-        
-        try:
-            # Find JSON in the response
-            start_idx = analysis_text.find('{')
-            end_idx = analysis_text.rfind('}') + 1
-            if start_idx != -1 and end_idx != 0:
-                json_str = analysis_text[start_idx:end_idx]
-                analysis_data = json.loads(json_str)
-                
-                # Enhance AI analysis with curated video recommendations
-                if "recommendations" not in analysis_data or not analysis_data["recommendations"]:
-                    recommendations = []
-                    for skill in skills:
-                        skill_videos = get_video_recommendations(skill, score)
-                        recommendations.extend(skill_videos)
-                    analysis_data["recommendations"] = recommendations
-            else:
-                raise Exception("No JSON found in response")
-        except json.JSONDecodeError:
-            # If JSON parsing fails, create a structured analysis
-            print(f"⚠️ JSON parsing failed for analysis, creating structured response")
-            analysis_data = create_structured_analysis(assessment_id, score, skills)
-        
-        print(f"✅ Analyzed assessment results with Cohere - Score: {score}%")
-        return analysis_data
-        
-    except Exception as e:
-        print(f"❌ Error analyzing results: {e}")
-        # Fallback to structured analysis
-        return create_structured_analysis(assessment_id, score, skills)
+    skill_scores = compute_skill_scores(questions, answers, skills)
+    
+    # Identical outcomes (same skills, score buckets and difficulty) share weak skills, videos and plan
+    signature = outcome_signature(skills, skill_scores, score, difficulty)
+    memo = analysis_cache.get(signature)
+    if memo is not None:
+        return {"assessment_id": assessment_id, "score": score, "skill_scores": skill_scores, **memo}
+    
+    analysis_data = create_structured_analysis(assessment_id, score, skills, skill_scores)
+    analysis_cache.set(signature, {
+        "weak_skills": analysis_data["weak_skills"],
+        "recommendations": analysis_data["recommendations"],
+        "improvement_plan": analysis_data["improvement_plan"],
+        "learning_path": analysis_data["learning_path"]
+    })
+    print(f"✅ Analyzed assessment results locally - Score: {score}%")
+    return analysis_data
 
-def create_structured_analysis(assessment_id: str, score: float, skills: List[str]) -> Dict:
+def create_structured_analysis(assessment_id: str, score: float, skills: List[str], skill_scores: Optional[Dict[str, Dict]] = None) -> Dict:
     """Create structured analysis with improved video recommendations"""
-    # Determine weak skills based on score
+    # Determine weak skills from per-skill levels when available, else from the overall score
     weak_skills = []
-    if score < 40:  # Changed from 80 to 40 to only mark skills below 40% as weak
+    if skill_scores:
+        weak_skills = [skill for skill, result in skill_scores.items() if result["level"] == "WEAK"]
+    elif score < 40:  # Changed from 80 to 40 to only mark skills below 40% as weak
         weak_skills = skills  # Skills need improvement if score is low
     
     # Generate recommendations using curated video system
     recommendations = []
     for skill in weak_skills:
-        skill_videos = get_video_recommendations(skill, score)
-        recommendations.extend(skill_videos)
+        skill_score = skill_scores[skill]["score"] if skill_scores else score
+        for video in get_video_recommendations(skill, skill_score):
+            recommendations.append(dict(video, skill=skill))
+    
+    # Ordered modules for the weak skills and any prerequisites not shown in this assessment
+    learning_path = build_learning_path(weak_skills, [skill for skill in skills if skill not in weak_skills])
     
     # Create improvement plan based on score
-    if score >= 80:
+    if weak_skills:
+        improvement_plan = f"Need improvement in {', '.join(weak_skills)}. Start with the recommended beginner videos and practice regularly."
+    elif score >= 80:
         improvement_plan = "Excellent performance! Keep practicing to maintain your high level of expertise."
     elif score >= 60:
         improvement_plan = "Good foundation! Continue practicing to strengthen your skills further."
-    elif score >= 40:
-        improvement_plan = "Average performance. Consider additional practice to improve your skills."
     else:
-        improvement_plan = f"Need improvement in {', '.join(weak_skills)}. Start with the recommended beginner videos and practice regularly."
+        improvement_plan = "Average performance. Consider additional practice to improve your skills."
     
     return {
         "assessment_id": assessment_id,
         "score": score,
+        "skill_scores": skill_scores or {},
         "weak_skills": weak_skills,
         "recommendations": recommendations,
-        "improvement_plan": improvement_plan
+        "improvement_plan": improvement_plan,
+        "learning_path": learning_path
     }
 
+def enrich_analysis_with_cohere(analysis: Dict, signature: tuple):
+    """Add an LLM-written improvement narrative to a stored analysis (runs after the response)"""
+    attempt_id = analysis["attempt_id"]
+    if not cohere_key:
+        publish_analysis_state("narrative", attempt_id, {"status": "unavailable"})
+        return
+    
+    skill_lines = "\n".join(
+        f"- {skill}: {result['score']}% ({result['level']})" for skill, result in analysis["skill_scores"].items()
+    )
+    prompt = f"""
+    A learner finished a technical skills assessment with an overall score of {analysis['score']}%.
+    Per-skill results:
+    {skill_lines}
+    
+    Write a short, encouraging, personalized improvement plan (3-5 sentences) focused on the weakest skills.
+    Return only the plan text.
+    """
+    
+    try:
+        response = call_cohere(
+            get_cohere_client().generate,
+            model="command",
+            prompt=prompt,
+            max_tokens=300,
+            temperature=0.5
+        )
+        narrative = {
+            "status": "ready",
+            "improvement_plan": response.generations[0].text.strip()
+        }
+        publish_analysis_state("narrative", attempt_id, narrative)
+        narrative_cache.set(signature, narrative)
+        print(f"✅ Added Cohere narrative for attempt {attempt_id}")
+    except Exception as e:
+        print(f"❌ Error generating analysis narrative: {e}")
+        publish_analysis_state("narrative", attempt_id, {"status": "unavailable"})
+
 # In-memory storage for assessments (in production, use a database)
+# Values are compact StoredAssessment objects: metadata plus interned question ids
 assessments_db = {}
 
+# Submitted analyses and their optional LLM narratives, keyed by attempt id: one assessment id
+# (a bundled or predefined one especially) is shared by everyone who takes it.
+# Bounded and expiring - the submission itself is kept in the event store
+ANALYSIS_RETENTION_MAX_ENTRIES = int(os.getenv("ANALYSIS_RETENTION_MAX_ENTRIES", "10000"))
+ANALYSIS_RETENTION_SECONDS = float(os.getenv("ANALYSIS_RETENTION_SECONDS", "86400"))
+analyses_db = BoundedTTLCache(ANALYSIS_RETENTION_MAX_ENTRIES, ANALYSIS_RETENTION_SECONDS)
+analysis_narratives = BoundedTTLCache(ANALYSIS_RETENTION_MAX_ENTRIES, ANALYSIS_RETENTION_SECONDS)
+
+# Issued assessments, analyses and narratives are also published host-wide, so a submission or an
+# analysis read served by another worker finds them. Entries too large for a slot stay worker-local
+SHARED_WORKER_STATE = os.getenv("SHARED_WORKER_STATE", "1") != "0"
+SHARED_STATE_BUCKETS = int(os.getenv("SHARED_STATE_BUCKETS", "512"))
+SHARED_STATE_SLOT_KB = int(os.getenv("SHARED_STATE_SLOT_KB", "16"))
+shared_assessments = open_shared_cache(
+    "issued_assessments", SHARED_STATE_BUCKETS, 4, SHARED_STATE_SLOT_KB * 1024, ANALYSIS_RETENTION_SECONDS
+) if SHARED_WORKER_STATE else None
+shared_analyses = open_shared_cache(
+    "analyses", SHARED_STATE_BUCKETS, 4, SHARED_STATE_SLOT_KB * 1024, ANALYSIS_RETENTION_SECONDS
+) if SHARED_WORKER_STATE else None
+
+def store_assessment(assessment: Dict, assessment_id: Optional[str] = None) -> str:
+    """Store an assessment compactly, optionally under a different id; returns the id"""
+    stored = StoredAssessment(assessment, assessment_id)
+    assessments_db[stored.assessment_id] = stored
+    if shared_assessments is not None:
+        shared_assessments.put(stored.assessment_id, stored.encoded())
+    return stored.assessment_id
+
+def load_assessment(assessment_id: str) -> Optional[Dict]:
+    """Materialize a stored assessment as a dict, from this worker or the host-wide store"""
+    stored = assessments_db.get(assessment_id)
+    if stored:
+        return stored.to_dict()
+    if shared_assessments is not None:
+        _, encoded = shared_assessments.get(assessment_id)
+        if encoded is not None:
+            return json.loads(encoded)
+    return None
+
+# Worker-local copies, by kind; host-wide keys are "<kind>:<attempt id>"
+local_analysis_state = {"analysis": analyses_db, "narrative": analysis_narratives}
+
+def publish_analysis_state(kind: str, attempt_id: str, value: Dict):
+    """Keep an analysis or its narrative in this worker and publish it host-wide"""
+    local_analysis_state[kind].set(attempt_id, value)
+    if shared_analyses is not None:
+        shared_analyses.put(f"{kind}:{attempt_id}", encode_json(value))
+
+def read_analysis_state(kind: str, attempt_id: str) -> Optional[Dict]:
+    """An analysis or narrative from this worker, or from the worker that handled the submission"""
+    value = local_analysis_state[kind].get(attempt_id)
+    if value is None and shared_analyses is not None:
+        _, encoded = shared_analyses.get(f"{kind}:{attempt_id}")
+        if encoded is not None:
+            value = json.loads(encoded)
+    return value
+
+# Whether submissions queue an LLM narrative after the response is sent
+LLM_ANALYSIS_ENRICHMENT = os.getenv("LLM_ANALYSIS_ENRICHMENT", "true").lower() == "true"
+
 # Create uploads directory if it doesn't exist
 UPLOADS_DIR = "uploads"
 VIDEOS_DIR = os.path.join(UPLOADS_DIR, "videos")
@@ -467,64 +885,216 @@ os.makedirs(VIDEOS_DIR, exist_ok=True)
 # Mount static files for video access
 app.mount("/uploads", StaticFiles(directory=UPLOADS_DIR), name="uploads")
 
+# Content-hashed assessment/video bundles, served with immutable cache headers
+os.makedirs(STATIC_BUNDLES_DIR, exist_ok=True)
+app.mount(STATIC_BUNDLES_URL, ImmutableStaticFiles(directory=STATIC_BUNDLES_DIR), name="static_bundles")
+static_manifest = {}
+
+def publish_static_bundles():
+    """Export static bundles and register their assessments so they can be submitted"""
+    manifest = export_static_bundles()
+    for assessment in load_bundle_assessments(manifest).values():
+        store_assessment(assessment)
+    static_manifest.clear()
+    static_manifest.update(manifest)
+    print(f"📦 Published {len(manifest['assessments']) + len(manifest['cached_assessments'])} static assessment bundles")
+
+@app.on_event("startup")
+def publish_static_bundles_on_startup():
+    publish_static_bundles()
+
+@app.on_event("shutdown")
+def drain_llm_calls():
+    # Requests are drained by the server; background LLM work (bank refills) is waited for here,
+    # before the event store and skill graph below are flushed
+    in_flight = llm_admission.stats()["in_flight"]
+    if in_flight:
+        print(f"⏳ Waiting for {in_flight} in-flight LLM calls to finish...")
+        if not llm_admission.wait_idle(LLM_DRAIN_SECONDS):
+            print("⚠️ Shutting down with LLM calls still in flight")
+
+def restore_from_event_store():
+    """Rebuild score analytics, leaderboards and dashboards from persisted submissions and uploads"""
+    restored = 0
+    events = heapq.merge(event_store.replay("submission"), event_store.replay("video_upload"), key=lambda event: event["created_at"])
+    for event in events:
+        user_id = event["user_id"]
+        at = datetime.fromtimestamp(event["created_at"])
+        if "video_url" in event:
+            if user_id:
+                dashboard_store.record_video_upload(user_id, event.get("skill"), event["video_url"], event.get("uploaded_at"), at)
+            continue
+        score_analytics.record(event["skill_scores"], event["score"], event.get("difficulty"))
+        restored += 1
+        if not user_id:
+            continue
+        leaderboards.record_submission(user_id, event["skill_scores"], at)
+        # Submissions stored before dashboards were replayed lack the title and weak skills
+        assessment = {
+            "assessment_id": event["assessment_id"],
+            "title": event.get("title", "Assessment"),
+            "skills_tested": event.get("skills_tested", list(event["skill_scores"]))
+        }
+        dashboard_store.record_assessment(user_id, assessment, {"score": event["score"], "weak_skills": event.get("weak_skills", [])}, at)
+        if event.get("learning_path"):
+            dashboard_store.update_section(user_id, "learning_path", event["learning_path"])
+    if restored:
+        print(f"📊 Restored {restored} submissions from the event store ({dashboard_store.user_count()} dashboards)")
+
+@app.on_event("startup")
+def start_event_store():
+    restore_from_event_store()
+    event_store.start()
+
+@app.on_event("shutdown")
+def stop_event_store():
+    # Drain buffered events to disk before the process exits
+    event_store.stop()
+
+@app.on_event("startup")
+def start_skill_graph():
+    skill_graph.start()
+
+@app.on_event("shutdown")
+def stop_skill_graph():
+    skill_graph.stop()
+
+def assessment_response(assessment: Dict, message: str):
+    """Store an assessment and build its response, reusing pre-encoded bytes for cached ones"""
+    encoded = get_encoded_assessment(assessment)
+    if encoded is None:
+        # Freshly sampled or composed: only the metadata is encoded here, each question was
+        # encoded once when it was first interned
+        assessment_id = store_assessment(assessment)
+        metadata = encode_json({key: value for key, value in assessment.items() if key != "questions"})
+        body = b''.join([
+            b'{"success":true,"assessment":', metadata[:-1], b',"questions":',
+            assessments_db[assessment_id].encoded_questions(), b'},"message":', encode_json(message), b'}'
+        ])
+        return Response(content=body, media_type="application/json")
+    
+    # Cached assessment: give this request its own id and splice it into the cached bytes
+    assessment_id = str(uuid.uuid4())
+    store_assessment(assessment, assessment_id)
+    prefix, suffix = encoded
+    body = b''.join([
+        b'{"success":true,"assessment":', prefix, encode_json(assessment_id), suffix,
+        b',"message":', encode_json(message), b'}'
+    ])
+    return Response(content=body, media_type="application/json")
+
 @app.get("/")
 def root():
     return {"message": "Resume Skill Extractor & Assessment System is running!", "version": "2.0.0"}
 
+def duplicate_resume_response(duplicate, filename: str) -> Dict:
+    """Earlier analysis reused for a duplicate resume"""
+    print(f"♻️ Resume {filename} matches {duplicate.resume_id} (similarity {duplicate.similarity})")
+    return dict(duplicate.result, filename=filename, resume_id=duplicate.resume_id, duplicate_of=duplicate.resume_id, similarity=duplicate.similarity)
+
+def process_resume(content: bytes, filename: str) -> Dict:
+    """Extract, de-duplicate and index one uploaded resume (CPU-bound; run off the event loop)"""
+    # Byte-identical re-uploads skip parsing entirely
+    digest = hashlib.sha256(content).hexdigest()
+    duplicate = resume_index.find_exact(digest)
+    if duplicate:
+        return duplicate_resume_response(duplicate, filename)
+    
+    # Extract text based on file type
+    if filename.lower().endswith('.pdf'):
+        text = extract_text_from_pdf(content)
+    else:
+        text = extract_text_from_txt(content)
+    
+    if not text.strip():
+        return {"error": "Could not extract text from the uploaded file"}
+
+    # Extract skills using local method
+    skills = extract_skills_locally(text)
+
+    # Lightly edited or re-exported copies reuse the earlier analysis, unless the edit changed
+    # the skills found (an edited copy with new skills is analyzed as a new resume)
+    signature = minhash(text)
+    duplicate = resume_index.find_similar(signature)
+    if duplicate and duplicate.result["skills"] == skills:
+        return duplicate_resume_response(duplicate, filename)
+    
+    # Only distinct resumes feed the co-occurrence graph
+    skill_graph.add_resume(skills)
+    
+    resume_id = str(uuid.uuid4())
+    result = {
+        "skills": skills,
+        "text_length": len(text),
+        "skills_count": len(skills),
+        "suggested_skills": skill_graph.next_skills(skills),
+        "extraction_method": "local_patterns"
+    }
+    resume_index.add(resume_id, signature, result, digest)
+    
+    return dict(result, filename=filename, resume_id=resume_id, duplicate_of=None, similarity=None)
+
 @app.post("/analyze_resume")
 async def analyze_resume(file: UploadFile = File(...)):
     try:
         content = await file.read()
         
-        # Extract text based on file type
-        if file.filename.lower().endswith('.pdf'):
-            text = extract_text_from_pdf(content)
-        else:
-            text = extract_text_from_txt(content)
-        
-        if not text.strip():
-            return {"error": "Could not extract text from the uploaded file"}
-
-        # Extract skills using local method
-        skills = extract_skills_locally(text)
-        
-        return {
-            "skills": skills,
-            "filename": file.filename,
-            "text_length": len(text),
-            "skills_count": len(skills),
-            "extraction_method": "local_patterns"
-        }
+        # PDF parsing, MinHash and skill matching take tens of milliseconds - keep them off the event loop
+        return await run_in_threadpool(process_resume, content, file.filename)
 
     except Exception as e:
         print(f"Error processing resume: {e}")
         return {"error": f"Error processing resume: {str(e)}"}
 
-@app.post("/generate_assessment")
+@app.post("/generate_assessment", dependencies=[Depends(rate_limited("generate_assessment"))])
 async def generate_assessment(request: AssessmentRequest):
     """Generate assessment based on extracted skills"""
     try:
         if not request.skills:
             raise HTTPException(status_code=400, detail="No skills provided")
         
-        # Generate assessment using Cohere AI
-        assessment = generate_assessment_with_cohere(request.skills, request.difficulty)
+        # Generate assessment using Cohere AI (off the event loop - it blocks on the LLM)
+        deadline = request_deadline(request)
+        assessment = await run_in_threadpool(generate_assessment_with_cohere, request.skills, request.difficulty, deadline)
         
-        # Store assessment in memory
-        assessment_id = assessment["assessment_id"]
-        assessments_db[assessment_id] = assessment
-        
-        return {
-            "success": True,
-            "assessment": assessment,
-            "message": f"Assessment generated for {len(request.skills)} skills"
-        }
+        return assessment_response(assessment, f"Assessment generated for {len(request.skills)} skills")
         
+    except OverloadedError as e:
+        raise too_many_requests(e.retry_after, "Assessment service is busy, please retry shortly")
     except Exception as e:
         print(f"Error generating assessment: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/generate_skill_assessment")
+@app.post("/generate_assessment_stream", dependencies=[Depends(rate_limited("generate_assessment"))])
+async def generate_assessment_stream(request: AssessmentRequest):
+    """Generate assessment and stream it as NDJSON events while questions are produced"""
+    if not request.skills:
+        raise HTTPException(status_code=400, detail="No skills provided")
+    
+    # Shed load before streaming starts - a 429 cannot be sent once the body has begun
+    if llm_admission.saturated():
+        raise too_many_requests(llm_admission.max_wait, "Assessment service is busy, please retry shortly")
+    
+    # Decide before the 200 goes out: without an API key, skills with no banked,
+    # cached or predefined questions can only fail once the body has started
+    if not cohere_key and not all(get_component_questions(skill, request.difficulty) for skill in request.skills):
+        raise HTTPException(status_code=503, detail="Cohere AI is required for assessment generation. Please configure a valid API key.")
+    
+    deadline = request_deadline(request)
+    
+    def event_lines():
+        assessment = None
+        for event in stream_assessment_with_cohere(request.skills, request.difficulty, deadline):
+            if event["type"] == "assessment":
+                assessment = event["assessment"]
+                event = {"type": "assessment", "assessment": {k: v for k, v in assessment.items() if k != "questions"}}
+            # Re-store as questions arrive so the growing assessment is visible to /submit_assessment
+            store_assessment(assessment)
+            yield json.dumps(event) + "\n"
+    
+    return StreamingResponse(event_lines(), media_type="application/x-ndjson")
+
+@app.post("/generate_skill_assessment", dependencies=[Depends(rate_limited("generate_assessment"))])
 async def generate_skill_assessment(request: AssessmentRequest):
     """Generate individual assessment for a single skill"""
     try:
@@ -534,23 +1104,17 @@ async def generate_skill_assessment(request: AssessmentRequest):
         skill = request.skills[0]
         
         # Generate assessment using Cohere AI for single skill
-        assessment = generate_assessment_with_cohere([skill], request.difficulty)
-        
-        # Store assessment in memory
-        assessment_id = assessment["assessment_id"]
-        assessments_db[assessment_id] = assessment
+        assessment = await run_in_threadpool(generate_assessment_with_cohere, [skill], request.difficulty, request_deadline(request))
         
-        return {
-            "success": True,
-            "assessment": assessment,
-            "message": f"Individual assessment generated for {skill}"
-        }
+        return assessment_response(assessment, f"Individual assessment generated for {skill}")
         
+    except OverloadedError as e:
+        raise too_many_requests(e.retry_after, "Assessment service is busy, please retry shortly")
     except Exception as e:
         print(f"Error generating skill assessment: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/generate_all_skill_assessments")
+@app.post("/generate_all_skill_assessments", dependencies=[Depends(rate_limited("generate_assessment"))])
 async def generate_all_skill_assessments(request: AssessmentRequest):
     """Generate individual assessments for each skill"""
     try:
@@ -558,18 +1122,21 @@ async def generate_all_skill_assessments(request: AssessmentRequest):
             raise HTTPException(status_code=400, detail="No skills provided")
         
         assessments = []
+        deadline = request_deadline(request)
         
-        # Generate individual assessment for each skill
+        # Generate individual assessment for each skill (sharing one time budget)
         for skill in request.skills:
             try:
-                assessment = generate_assessment_with_cohere([skill], request.difficulty)
-                assessment_id = assessment["assessment_id"]
-                assessments_db[assessment_id] = assessment
+                assessment = await run_in_threadpool(generate_assessment_with_cohere, [skill], request.difficulty, deadline)
+                assessment_id = store_assessment(assessment)
                 assessments.append({
                     "skill": skill,
                     "assessment_id": assessment_id,
                     "assessment": assessment
                 })
+            except OverloadedError:
+                # Load shedding applies to the whole request, not to one skill
+                raise
             except Exception as e:
                 print(f"Error generating assessment for {skill}: {e}")
                 assessments.append({
@@ -583,16 +1150,23 @@ async def generate_all_skill_assessments(request: AssessmentRequest):
             "message": f"Generated {len(assessments)} individual skill assessments"
         }
         
+    except OverloadedError as e:
+        raise too_many_requests(e.retry_after, "Assessment service is busy, please retry shortly")
     except Exception as e:
         print(f"Error generating all skill assessments: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/submit_assessment")
-async def submit_assessment(submission: AssessmentSubmission):
+@app.post("/submit_assessment", dependencies=[Depends(rate_limited("submit_assessment"))])
+async def submit_assessment(submission: AssessmentSubmission, background_tasks: BackgroundTasks, request: Request):
     """Submit assessment answers and get analysis"""
+    # Backpressure: refuse new submissions while the event store is behind on disk writes
+    if event_store.saturated():
+        raise HTTPException(status_code=503, detail="Submissions are temporarily backed up, please retry shortly", headers={"Retry-After": str(max(1, math.ceil(event_store.flush_seconds)))})
+    user_id = resolve_user_id(request, submission.user_id)
+    
     try:
         # Get the original assessment
-        assessment = assessments_db.get(submission.assessment_id)
+        assessment = load_assessment(submission.assessment_id)
         if not assessment:
             raise HTTPException(status_code=404, detail="Assessment not found")
         
@@ -608,15 +1182,50 @@ async def submit_assessment(submission: AssessmentSubmission):
             else:
                 checked_answers[question_id] = "incorrect"
         
-        # Analyze results
+        # Analyze results locally - the LLM narrative, if enabled, is added after responding
         analysis = analyze_assessment_results(
             submission.assessment_id,
             checked_answers,
-            assessment["skills_tested"]
+            assessment["skills_tested"],
+            assessment["questions"],
+            assessment.get("difficulty", "intermediate")
         )
+        analysis["attempt_id"] = str(uuid.uuid4())
+        publish_analysis_state("analysis", analysis["attempt_id"], analysis)
+        score_analytics.record(analysis["skill_scores"], analysis["score"], assessment.get("difficulty", "intermediate"))
         
-        if "error" in analysis:
-            raise HTTPException(status_code=500, detail=analysis["error"])
+        # Keep the user's materialized dashboard current; the event carries what a restart needs to rebuild it
+        learning_modules = dashboard_modules(analysis["learning_path"]) if analysis["learning_path"] else []
+        event_store.append("submission", {
+            "assessment_id": submission.assessment_id,
+            "attempt_id": analysis["attempt_id"],
+            "title": assessment.get("title", "Assessment"),
+            "skills_tested": assessment["skills_tested"],
+            "difficulty": assessment.get("difficulty", "intermediate"),
+            "score": analysis["score"],
+            "skill_scores": analysis["skill_scores"],
+            "weak_skills": analysis["weak_skills"],
+            "learning_path": learning_modules,
+            "time_taken": submission.time_taken
+        }, user_id)
+        if user_id:
+            dashboard_store.record_assessment(user_id, assessment, analysis)
+            leaderboards.record_submission(user_id, analysis["skill_scores"])
+            if learning_modules:
+                dashboard_store.update_section(user_id, "learning_path", learning_modules)
+        if LLM_ANALYSIS_ENRICHMENT and cohere_key:
+            signature = outcome_signature(
+                assessment["skills_tested"],
+                analysis["skill_scores"],
+                analysis["score"],
+                assessment.get("difficulty", "intermediate")
+            )
+            cached_narrative = narrative_cache.get(signature)
+            if cached_narrative:
+                publish_analysis_state("narrative", analysis["attempt_id"], cached_narrative)
+            else:
+                publish_analysis_state("narrative", analysis["attempt_id"], {"status": "pending"})
+                background_tasks.add_task(enrich_analysis_with_cohere, analysis, signature)
         
         return {
             "success": True,
@@ -628,13 +1237,28 @@ async def submit_assessment(submission: AssessmentSubmission):
         print(f"Error submitting assessment: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/assessment_analysis/{attempt_id}")
+def get_assessment_analysis(attempt_id: str):
+    """Return a submitted analysis together with its LLM narrative, once available"""
+    analysis = read_analysis_state("analysis", attempt_id)
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    return {
+        "success": True,
+        "analysis": analysis,
+        "narrative": read_analysis_state("narrative", attempt_id) or {"status": "unavailable"}
+    }
+
 @app.post("/upload_skill_video")
 async def upload_skill_video(
+    request: Request,
     video: UploadFile = File(...),
-    skill: str = None,
-    duration: int = None
+    skill: str = Form(None),
+    duration: int = Form(None),
+    user_id: str = Form(None)
 ):
     """Upload a skill demonstration video"""
+    user_id = resolve_user_id(request, user_id)
     try:
         # Validate file type
         if not video.content_type.startswith('video/'):
@@ -654,6 +1278,15 @@ async def upload_skill_video(
         
         print(f"✅ Video uploaded: {filename} for skill: {skill}")
         
+        if user_id:
+            dashboard_store.record_video_upload(user_id, skill, video_url, timestamp)
+        event_store.append("video_upload", {
+            "skill": skill,
+            "video_url": video_url,
+            "duration": duration,
+            "uploaded_at": timestamp
+        }, user_id)
+        
         return {
             "success": True,
             "video_url": video_url,
@@ -667,64 +1300,128 @@ async def upload_skill_video(
         print(f"❌ Error uploading video: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/static_manifest")
+def get_static_manifest():
+    """Return the manifest of content-hashed static bundles"""
+    return static_manifest
+
+@app.post("/static_bundles/rebuild", dependencies=[Depends(require_admin)])
+def rebuild_static_bundles():
+    """Re-export static bundles, including assessments warmed into the cache since startup"""
+    publish_static_bundles()
+    return static_manifest
+
+@app.get("/question_bank/stats")
+def question_bank_stats():
+    """Report how many questions the bank holds per skill"""
+    return question_bank.stats()
+
 @app.get("/health")
 def health_check():
     return {
         "status": "healthy", 
         "service": "resume-skill-extractor-assessment",
-        "cohere_configured": cohere_client is not None
+        "cohere_configured": bool(cohere_key),
+        "llm_circuit": cohere_breaker.stats(),
+        "analysis_cache": analysis_cache.stats(),
+        "assessment_cache": assessment_cache_stats(),
+        "skill_catalog": skill_catalog.stats(),
+        "llm_admission": llm_admission.stats(),
+        "event_store": event_store.stats(),
+        "resume_index": resume_index.stats(),
+        "learning_path_cache": learning_path_stats()
     }
 
+@app.get("/health/live")
+async def liveness_probe():
+    """Liveness: the process is up and its event loop answers requests"""
+    return {"status": "alive", "event_loop": event_loop_monitor.stats()}
 
-# --- New: User Dashboard Data Endpoint ---
-@app.get("/user_dashboard/{user_id}")
-def get_user_dashboard(user_id: str):
-    """Return mock user dashboard data for chatbot integration"""
-    # In production, fetch from database
-    return {
-        "user_id": user_id,
-        "profile": {
-            "name": "Ravi Kumar",
-            "email": "ravi.kumar@example.com",
-            "joined": "2024-01-15",
-            "skills": ["JavaScript", "React", "Python"],
-            "badges": ["Top Performer", "Hackathon Winner"]
-        },
-        "progress_tracker": [
-            {"milestone": "Profile Created", "timestamp": "2024-01-15T10:00:00"},
-            {"milestone": "Assessment Completed", "timestamp": "2024-01-20T14:30:00"},
-            {"milestone": "Skills Evaluated", "timestamp": "2024-01-21T09:00:00"},
-            {"milestone": "Learning Path Generated", "timestamp": "2024-01-22T11:15:00"}
-        ],
-        "learning_path": [
-            {"module": "JavaScript Basics", "estimated_time": "2h", "status": "completed"},
-            {"module": "React Fundamentals", "estimated_time": "3h", "status": "in_progress"},
-            {"module": "Python for Web", "estimated_time": "2.5h", "status": "not_started"}
-        ],
-        "assessments": {
-            "upcoming": [
-                {"title": "Advanced React Quiz", "date": "2025-08-15"}
-            ],
-            "past": [
-                {"title": "JavaScript Basics", "score": 85, "date": "2024-01-20"},
-                {"title": "Python Fundamentals", "score": 78, "date": "2024-02-10"}
-            ]
+@app.get("/health/ready")
+async def readiness_probe():
+    """Readiness: 503 while this instance is starting up or saturated"""
+    assessment_cache_info = assessment_cache_stats()
+    ready, report = readiness_report(
+        loop=event_loop_monitor.stats(),
+        admission=llm_admission.stats(),
+        llm=dict(cohere_breaker.stats(), configured=bool(cohere_key), recent=cohere_breaker.recent()),
+        event_store_saturated=event_store.saturated(),
+        caches={
+            # The last startup hook has run: static bundles published, history restored
+            "warm": startup_timer.startup_seconds is not None,
+            "assessment_cache_entries": assessment_cache_info["entries"],
+            "assessment_cache_hit_rate": assessment_cache_info.get("host", {}).get("hit_rate"),
+            "analysis_cache_entries": analysis_cache.stats()["entries"],
+            "question_bank_questions": question_bank.stats()["total_questions"],
+            "static_bundles": len(static_manifest.get("assessments", {}))
         },
-        "hackathons": {
-            "available": [
-                {"name": "Summer CodeFest", "status": "open"}
-            ],
-            "applied": [
-                {"name": "AI Challenge", "status": "Applied", "submission_status": "Pending"}
-            ]
-        },
-        "leaderboard": {
-            "position": 5,
-            "total_users": 120,
-            "achievements": ["Top 5% performer this week"]
-        }
-    }
+        uploads_dir=UPLOADS_DIR
+    )
+    return JSONResponse(status_code=200 if ready else 503, content=report)
+
+
+# --- Skill Graph Endpoints ---
+@app.get("/skill_graph/related/{skill}")
+def get_related_skills(skill: str, limit: int = 5):
+    """Skills most commonly listed together with a skill on analyzed resumes"""
+    return {"skill": skill, "related": skill_graph.related(skill, max(1, min(limit, 50)))}
+
+@app.get("/skill_graph/next")
+def get_next_skills(skills: str, limit: int = 5):
+    """Skills to learn next given a comma-separated list of known skills"""
+    known = [skill for skill in skills.split(",") if skill.strip()]
+    return {"known_skills": known, "next_skills": skill_graph.next_skills(known, max(1, min(limit, 50)))}
+
+@app.get("/skill_graph/stats")
+def get_skill_graph_stats():
+    return skill_graph.stats()
+
+# --- Admin Analytics Endpoint ---
+@app.get("/admin/score_analytics")
+def get_score_analytics(skill: Optional[str] = None, difficulty: Optional[str] = None):
+    """Running score stats per skill and difficulty (count, mean, p50/p90, pass rate)"""
+    report = score_analytics.report(skill, difficulty)
+    report["weakest_skills"] = score_analytics.weakest_skills(skill=skill, difficulty=difficulty)
+    return report
+
+# --- Leaderboard Endpoints ---
+@app.get("/leaderboard")
+def get_leaderboard(board: str = "overall", limit: int = 10):
+    """Top users on a board: "overall", "weekly" or a skill name"""
+    total_users, entries = leaderboards.top(board, max(1, min(limit, 100)))
+    return {"board": leaderboards.resolve(board), "total_users": total_users, "entries": entries}
+
+@app.get("/leaderboard/{user_id}")
+def get_leaderboard_standing(user_id: str, board: str = "overall", radius: int = 2):
+    """A user's rank on a board with the users just above and below"""
+    standing = leaderboards.standing(board, user_id, max(0, min(radius, 25)))
+    return {"board": leaderboards.resolve(board), "user_id": user_id, **standing}
+
+# --- User Dashboard Data Endpoint ---
+@app.get("/user_dashboard/{user_id}", dependencies=[Depends(require_user)])
+def get_user_dashboard(user_id: str, request: Request):
+    """Return the user's materialized dashboard (supports If-None-Match)"""
+    # The leaderboard position moves whenever anyone scores, so it is computed live (O(log n))
+    live_sections = {"leaderboard": leaderboards.dashboard_block(user_id)}
+    etag = dashboard_store.etag(user_id, live_sections)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    etag, body = dashboard_store.get(user_id, live_sections)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+# --- Startup Report ---
+@app.get("/startup_report")
+def get_startup_report():
+    """Cold-start timings: module imports, startup hooks, lazy loads and first request"""
+    return startup_timer.report()
+
+@app.on_event("startup")
+def end_startup_timing():
+    startup_timer.startup_end()
+
+# Everything main needs is imported now; stop timing imports
+startup_timer.uninstall()
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8002)
+    uvicorn.run(app, host="127.0.0.1", port=int(os.getenv("PORT", "8002")))
@@ -0,0 +1,183 @@
+"""
+Question Bank
+Persistent pool of curated and generated questions indexed by (skill, difficulty, topic)
+so every user can get a freshly sampled assessment without a new LLM call
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from assessment_cache import PREDEFINED_ASSESSMENTS
+
+DIFFICULTIES = ["beginner", "intermediate", "advanced"]
+DEFAULT_TOPIC = "general"
+
+# Where the bank is persisted (append-only JSON lines, one question per line)
+QUESTION_BANK_PATH = os.getenv(
+    "QUESTION_BANK_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "question_bank.jsonl")
+)
+
+# A bucket holding fewer questions than this is considered low and worth refilling
+LOW_WATERMARK = int(os.getenv("QUESTION_BANK_LOW_WATERMARK", "10"))
+
+
+def skill_key(skill: str) -> str:
+    """Normalize a skill name for indexing"""
+    return skill.strip().lower()
+
+
+def question_fingerprint(skill: str, question_text: str) -> str:
+    """Stable fingerprint used to de-duplicate questions"""
+    normalized = re.sub(r"[^a-z0-9]+", " ", question_text.lower()).strip()
+    return hashlib.sha1(f"{skill_key(skill)}|{normalized}".encode("utf-8")).hexdigest()
+
+
+def make_record(skill: str, difficulty: str, question: Dict, source: str) -> Optional[Dict]:
+    """Bank record for a question; None if it lacks its text, options or answer"""
+    text = question.get("question")
+    if not text or not question.get("options") or not question.get("correct_answer"):
+        return None
+    return {
+        "skill": skill,
+        "question": text,
+        "options": list(question["options"]),
+        "correct_answer": question["correct_answer"],
+        "explanation": question.get("explanation", ""),
+        "difficulty": difficulty,
+        "topic": question.get("topic") or DEFAULT_TOPIC,
+        "source": source,
+        "fingerprint": question_fingerprint(skill, text)
+    }
+
+
+class QuestionBank:
+    """In-memory question index backed by an append-only file.
+
+    Curated questions (skill -> predefined assessment) are indexed the first time their
+    skill is looked up, so the catalog is only decoded for skills that are actually used"""
+
+    def __init__(self, path: Optional[str] = None, curated: Optional[Mapping[str, Dict]] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fingerprints = set()
+        self._by_skill: Dict[Tuple[str, str], List[Dict]] = {}
+        self._by_topic: Dict[Tuple[str, str, str], List[Dict]] = {}
+        self._curated = curated
+        self._unseeded = {skill_key(skill): skill for skill in curated} if curated else {}
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        loaded = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                # Curated questions come from the skill catalog, not the file
+                if record.get("source") == "curated":
+                    continue
+                if self._index(record):
+                    loaded += 1
+        print(f"📦 Loaded {loaded} questions into the question bank")
+
+    def _index(self, record: Dict) -> bool:
+        """Add a record to the in-memory indexes; False if it is a duplicate"""
+        fingerprint = record["fingerprint"]
+        if fingerprint in self._fingerprints:
+            return False
+        self._fingerprints.add(fingerprint)
+        key = skill_key(record["skill"])
+        self._by_skill.setdefault((key, record["difficulty"]), []).append(record)
+        self._by_topic.setdefault((key, record["difficulty"], record["topic"]), []).append(record)
+        return True
+
+    def _seed_curated(self, key: str):
+        """Index a skill's curated questions on its first lookup, each at the difficulty the catalog gives it"""
+        if key not in self._unseeded:
+            return
+        with self._lock:
+            skill = self._unseeded.pop(key, None)
+            if skill is None:
+                return
+            for question in self._curated[skill]["questions"]:
+                difficulty = question.get("difficulty")
+                record = make_record(skill, difficulty if difficulty in DIFFICULTIES else "intermediate", question, "curated")
+                if record:
+                    self._index(record)
+
+    def add_questions(self, skill: str, difficulty: str, questions: List[Dict], source: str = "ai_generated") -> int:
+        """Add questions for a skill, skipping duplicates; returns how many were new"""
+        self._seed_curated(skill_key(skill))
+        new_records = []
+        with self._lock:
+            for question in questions:
+                record = make_record(skill, difficulty, question, source)
+                if record and self._index(record):
+                    new_records.append(record)
+            if new_records and self.path and source != "curated":
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for record in new_records:
+                        f.write(json.dumps(record) + "\n")
+        return len(new_records)
+
+    def count(self, skill: str, difficulty: Optional[str] = None, topic: Optional[str] = None) -> int:
+        """Number of questions available for a skill (optionally per difficulty/topic)"""
+        key = skill_key(skill)
+        self._seed_curated(key)
+        difficulties = [difficulty] if difficulty else DIFFICULTIES
+        if topic:
+            return sum(len(self._by_topic.get((key, d, topic), [])) for d in difficulties)
+        return sum(len(self._by_skill.get((key, d), [])) for d in difficulties)
+
+    def is_low(self, skill: str, difficulty: str) -> bool:
+        """True if the bucket should be refilled with new generated questions"""
+        return self.count(skill, difficulty) < LOW_WATERMARK
+
+    def sample(self, skill: str, difficulty: str, k: int, topic: Optional[str] = None) -> List[Dict]:
+        """Draw up to k distinct random questions, topping up from other difficulties"""
+        key = skill_key(skill)
+        self._seed_curated(key)
+        # Requested difficulty first, then the others
+        order = [difficulty] + [d for d in DIFFICULTIES if d != difficulty]
+        picked = []
+        with self._lock:
+            for d in order:
+                bucket = self._by_topic.get((key, d, topic), []) if topic else self._by_skill.get((key, d), [])
+                needed = k - len(picked)
+                if needed <= 0:
+                    break
+                picked.extend(random.sample(bucket, min(needed, len(bucket))))
+        return [
+            {
+                "skill": record["skill"],
+                "question": record["question"],
+                "options": list(record["options"]),
+                "correct_answer": record["correct_answer"],
+                "explanation": record["explanation"],
+                "topic": record["topic"]
+            }
+            for record in picked
+        ]
+
+    def stats(self) -> Dict:
+        """Bank size per skill (curated questions count once their skill has been looked up)"""
+        per_skill = {}
+        for (key, _), bucket in self._by_skill.items():
+            per_skill[key] = per_skill.get(key, 0) + len(bucket)
+        return {"total_questions": len(self._fingerprints), "skills": per_skill}
+
+
+# Shared bank for this process
+question_bank = QuestionBank(QUESTION_BANK_PATH, PREDEFINED_ASSESSMENTS)
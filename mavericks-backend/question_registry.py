@@ -0,0 +1,146 @@
+"""
+Question Registry
+Interns every question as one immutable record so stored assessments only keep
+an array of question ids plus a little metadata; each record is JSON-encoded once
+and reused by every response that includes it
+"""
+
+import sys
+import threading
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from assessment_cache import encode_json
+
+
+class QuestionRecord(NamedTuple):
+    """Immutable, shared question"""
+    skill: str
+    question: str
+    options: Tuple[str, ...]
+    correct_answer: str
+    explanation: str
+    topic: str = ""
+
+    def to_dict(self, question_id: str) -> Dict:
+        question = {
+            "id": question_id,
+            "skill": self.skill,
+            "question": self.question,
+            "options": list(self.options),
+            "correct_answer": self.correct_answer,
+            "explanation": self.explanation
+        }
+        if self.topic:
+            question["topic"] = self.topic
+        return question
+
+
+class QuestionRegistry:
+    """Append-only table of interned question records"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: List[QuestionRecord] = []
+        self._ids: Dict[QuestionRecord, int] = {}
+        # JSON object members of each record (everything but the id), encoded on first use
+        self._encoded: List[Optional[bytes]] = []
+
+    def intern(self, question: Dict) -> int:
+        """Return the id of an equal record, registering the question if it is new"""
+        record = QuestionRecord(
+            sys.intern(str(question.get("skill", ""))),
+            str(question.get("question", "")),
+            tuple(str(option) for option in question.get("options", [])),
+            str(question.get("correct_answer", "")),
+            str(question.get("explanation", "")),
+            str(question.get("topic") or "")
+        )
+        with self._lock:
+            record_id = self._ids.get(record)
+            if record_id is None:
+                record_id = len(self._records)
+                self._records.append(record)
+                self._encoded.append(None)
+                self._ids[record] = record_id
+            return record_id
+
+    def get(self, record_id: int) -> QuestionRecord:
+        return self._records[record_id]
+
+    def encoded(self, record_id: int) -> bytes:
+        """Pre-encoded JSON members of a record, e.g. '"skill":"Python",...' (no braces, no id)"""
+        encoded = self._encoded[record_id]
+        if encoded is None:
+            # Racing threads encode the same bytes, so the last write wins harmlessly
+            question = self._records[record_id].to_dict("")
+            del question["id"]
+            encoded = self._encoded[record_id] = encode_json(question)[1:-1]
+        return encoded
+
+    def __len__(self):
+        return len(self._records)
+
+
+# Shared registry for this process
+question_registry = QuestionRegistry()
+
+
+class StoredAssessment:
+    """Compact stored assessment: metadata plus interned question ids"""
+
+    __slots__ = ("assessment_id", "title", "difficulty", "skills_tested", "question_ids", "labels", "created_at", "source")
+
+    def __init__(self, assessment: Dict, assessment_id: Optional[str] = None):
+        questions = assessment.get("questions", [])
+        self.assessment_id = assessment_id or assessment["assessment_id"]
+        self.title = assessment.get("title", "")
+        self.difficulty = sys.intern(assessment.get("difficulty", "intermediate"))
+        self.skills_tested = tuple(sys.intern(skill) for skill in assessment.get("skills_tested", []))
+        self.question_ids = array("I", (question_registry.intern(question) for question in questions))
+        # Question ids are only kept when they differ from the usual q1..qN numbering
+        labels = tuple(str(question.get("id")) for question in questions)
+        self.labels = None if labels == tuple(f"q{i+1}" for i in range(len(labels))) else labels
+        self.created_at = assessment.get("created_at")
+        self.source = assessment.get("source")
+
+    def question_label(self, index: int) -> str:
+        return self.labels[index] if self.labels is not None else f"q{index+1}"
+
+    def questions(self) -> List[Dict]:
+        """Materialize fresh question dicts (safe to mutate)"""
+        return [
+            question_registry.get(record_id).to_dict(self.question_label(i))
+            for i, record_id in enumerate(self.question_ids)
+        ]
+
+    def encoded_questions(self) -> bytes:
+        """The questions as a JSON array, built from the pre-encoded records"""
+        return b"[" + b",".join(
+            b'{"id":' + encode_json(self.question_label(i)) + b"," + question_registry.encoded(record_id) + b"}"
+            for i, record_id in enumerate(self.question_ids)
+        ) + b"]"
+
+    def to_dict(self) -> Dict:
+        """Materialize the full assessment dict"""
+        return {
+            "assessment_id": self.assessment_id,
+            "title": self.title,
+            "difficulty": self.difficulty,
+            "skills_tested": list(self.skills_tested),
+            "questions": self.questions(),
+            "created_at": self.created_at,
+            "source": self.source
+        }
+
+    def encoded(self) -> bytes:
+        """The full assessment as JSON, built from the pre-encoded question records"""
+        metadata = encode_json({
+            "assessment_id": self.assessment_id,
+            "title": self.title,
+            "difficulty": self.difficulty,
+            "skills_tested": list(self.skills_tested),
+            "created_at": self.created_at,
+            "source": self.source
+        })
+        return metadata[:-1] + b',"questions":' + self.encoded_questions() + b'}'
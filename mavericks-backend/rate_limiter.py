@@ -0,0 +1,203 @@
+"""
+Rate Limiting and Admission Control
+Per-client token buckets for LLM-backed endpoints and a global cap on in-flight LLM calls
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Per-endpoint limits: (tokens refilled per second, bucket capacity / burst size)
+ENDPOINT_LIMITS: Dict[str, Tuple[float, int]] = {
+    "generate_assessment": (
+        float(os.getenv("GENERATE_RATE_PER_SECOND", "0.2")),
+        int(os.getenv("GENERATE_BURST", "5"))
+    ),
+    "submit_assessment": (
+        float(os.getenv("SUBMIT_RATE_PER_SECOND", "0.5")),
+        int(os.getenv("SUBMIT_BURST", "10"))
+    ),
+}
+
+# Global admission control for LLM calls
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "16"))
+LLM_MAX_QUEUE_WAIT_SECONDS = float(os.getenv("LLM_MAX_QUEUE_WAIT_SECONDS", "10"))
+
+# How long shutdown waits for in-flight LLM calls (e.g. background question bank refills)
+LLM_DRAIN_SECONDS = float(os.getenv("LLM_DRAIN_SECONDS", "20"))
+
+# The per-IP bucket allows this many times the per-endpoint limit, since several users may
+# share one address; the X-User-Id bucket, when present, applies the limit itself
+IP_LIMIT_MULTIPLIER = float(os.getenv("RATE_LIMIT_IP_MULTIPLIER", "2"))
+
+# How many client buckets to remember before evicting the least recently used
+MAX_TRACKED_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+
+
+class OverloadedError(Exception):
+    """Raised when a call is shed because the LLM queue is full"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Classic token bucket; not thread-safe on its own (guarded by RateLimiter)"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def wait_time(self) -> float:
+        """Refill, then return 0 if a token is available, else seconds until one is"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            return 0.0
+        if self.rate <= 0:
+            return 60.0
+        return (1 - self.tokens) / self.rate
+
+    def try_acquire(self) -> float:
+        """Take one token; returns 0 on success, else seconds until a token is available"""
+        retry_after = self.wait_time()
+        if not retry_after:
+            self.tokens -= 1
+        return retry_after
+
+
+class RateLimiter:
+    """Token buckets per (client, endpoint), bounded to MAX_TRACKED_CLIENTS entries"""
+
+    def __init__(self, limits: Dict[str, Tuple[float, int]] = None, max_clients: int = MAX_TRACKED_CLIENTS):
+        self.limits = limits if limits is not None else ENDPOINT_LIMITS
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _bucket(self, client_key: str, endpoint: str, limit: Tuple[float, int], multiplier: float) -> TokenBucket:
+        key = (client_key, endpoint)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(limit[0] * multiplier, max(1, int(limit[1] * multiplier)))
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def check(self, client_key: str, endpoint: str, multiplier: float = 1.0) -> float:
+        """Consume a token for this client/endpoint; returns seconds to wait (0 if allowed)"""
+        return self.check_all([(client_key, multiplier)], endpoint)
+
+    def check_all(self, client_keys: List[Tuple[str, float]], endpoint: str) -> float:
+        """Consume a token from every (client key, multiplier) bucket, or from none of them if any
+        is empty; returns seconds to wait (0 if allowed)"""
+        limit = self.limits.get(endpoint)
+        if limit is None:
+            return 0.0
+        with self._lock:
+            buckets = [self._bucket(key, endpoint, limit, multiplier) for key, multiplier in client_keys]
+            retry_after = max((bucket.wait_time() for bucket in buckets), default=0.0)
+            if retry_after:
+                self.rejected += 1
+                return retry_after
+            for bucket in buckets:
+                bucket.tokens -= 1
+            return 0.0
+
+
+class ConcurrencyLimiter:
+    """Caps concurrent calls; a bounded number of callers may wait, the rest are shed"""
+
+    def __init__(self, max_in_flight: int = LLM_MAX_IN_FLIGHT, max_queue: int = LLM_MAX_QUEUE, max_wait: float = LLM_MAX_QUEUE_WAIT_SECONDS):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._condition = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.shed = 0
+
+    def saturated(self) -> bool:
+        """True if a new caller would be shed right now"""
+        with self._condition:
+            return self.in_flight >= self.max_in_flight and self.waiting >= self.max_queue
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Take a slot, waiting in the bounded queue; raises OverloadedError when shed"""
+        timeout = self.max_wait if timeout is None else timeout
+        with self._condition:
+            if self.in_flight < self.max_in_flight:
+                self.in_flight += 1
+                return
+            if self.waiting >= self.max_queue:
+                self.shed += 1
+                raise OverloadedError("LLM queue is full", self.max_wait)
+            self.waiting += 1
+            try:
+                deadline = time.monotonic() + timeout
+                while self.in_flight >= self.max_in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.shed += 1
+                        raise OverloadedError("Timed out waiting for an LLM slot", self.max_wait)
+                    self._condition.wait(remaining)
+                self.in_flight += 1
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                # Also wakes wait_idle() callers
+                self._condition.notify_all()
+            else:
+                self._condition.notify()
+
+    def wait_idle(self, timeout: float) -> bool:
+        """Block until no calls are in flight (used to drain on shutdown); False on timeout"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self.in_flight > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None):
+        self.acquire(timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict:
+        with self._condition:
+            return {
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "max_in_flight": self.max_in_flight,
+                "max_queue": self.max_queue,
+                "shed": self.shed
+            }
+
+
+# Shared limiters for this process
+rate_limiter = RateLimiter()
+llm_admission = ConcurrencyLimiter()
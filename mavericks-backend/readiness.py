@@ -0,0 +1,131 @@
+"""
+Liveness and Readiness
+Event-loop lag sampling plus the checks behind the readiness probe: a load balancer
+should stop routing to an instance whose loop is stalling, whose LLM queue is full,
+whose event store is backed up or whose upload disk is nearly full
+"""
+
+import asyncio
+import os
+import shutil
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# How often the event loop is sampled and how many samples count as "recent"
+LOOP_SAMPLE_SECONDS = float(os.getenv("LOOP_SAMPLE_SECONDS", "0.5"))
+LOOP_SAMPLES = 60
+
+# Readiness thresholds
+READY_MAX_LOOP_LAG_MS = float(os.getenv("READY_MAX_LOOP_LAG_MS", "250"))
+READY_MAX_QUEUE_FRACTION = float(os.getenv("READY_MAX_QUEUE_FRACTION", "0.75"))
+READY_MIN_FREE_MB = float(os.getenv("READY_MIN_FREE_MB", "500"))
+
+# LLM figures above these are reported as warnings; they do not fail readiness
+LLM_WARN_ERROR_RATE = float(os.getenv("LLM_WARN_ERROR_RATE", "0.5"))
+LLM_WARN_P95_MS = float(os.getenv("LLM_WARN_P95_MS", "8000"))
+
+
+class EventLoopMonitor:
+    """Sleeps for a fixed interval on the event loop and records how late it wakes up"""
+
+    def __init__(self, interval: float = LOOP_SAMPLE_SECONDS):
+        self.interval = interval
+        self._lags = deque(maxlen=LOOP_SAMPLES)
+        self._task: Optional[asyncio.Task] = None
+        self.last_sample_at: Optional[float] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._lags.append(max(0.0, loop.time() - expected))
+            self.last_sample_at = time.time()
+
+    def start(self):
+        """Start sampling on the running loop (call from an async startup hook)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict:
+        lags = list(self._lags)
+        return {
+            "lag_ms": round(lags[-1] * 1000, 1) if lags else None,
+            "max_recent_lag_ms": round(max(lags) * 1000, 1) if lags else None,
+            "samples": len(lags),
+            "running": self._task is not None and not self._task.done()
+        }
+
+
+def disk_check(path: str) -> Dict:
+    usage = shutil.disk_usage(path)
+    free_mb = usage.free / (1024 * 1024)
+    return {
+        "path": os.path.abspath(path),
+        "free_mb": round(free_mb),
+        "used_percent": round(100 * usage.used / usage.total, 1) if usage.total else None,
+        "min_free_mb": READY_MIN_FREE_MB,
+        "ok": free_mb >= READY_MIN_FREE_MB
+    }
+
+
+def readiness_report(loop: Dict, admission: Dict, llm: Dict, event_store_saturated: bool,
+                     caches: Dict, uploads_dir: str) -> Tuple[bool, Dict]:
+    """Combine the per-dependency figures into (ready, report)"""
+    failing: List[str] = []
+    warnings: List[str] = []
+
+    lag = loop["max_recent_lag_ms"]
+    loop = dict(loop, limit_ms=READY_MAX_LOOP_LAG_MS, ok=lag is None or lag <= READY_MAX_LOOP_LAG_MS)
+    if not loop["ok"]:
+        failing.append(f"event loop lag {lag}ms over {READY_MAX_LOOP_LAG_MS:g}ms")
+
+    # Stop taking traffic before the LLM queue fills and requests start being shed
+    queue_limit = max(1, int(admission["max_queue"] * READY_MAX_QUEUE_FRACTION))
+    admission = dict(admission, queue_limit=queue_limit, ok=admission["waiting"] < queue_limit)
+    if not admission["ok"]:
+        failing.append(f"{admission['waiting']} LLM calls queued (limit {queue_limit})")
+
+    # The LLM is shared by every instance and has fallbacks, so it only produces warnings
+    recent = llm.get("recent", {})
+    if llm.get("state") not in (None, "closed"):
+        warnings.append(f"LLM circuit {llm['state']}")
+    if recent.get("error_rate") is not None and recent["error_rate"] >= LLM_WARN_ERROR_RATE:
+        warnings.append(f"LLM error rate {recent['error_rate']:.0%}")
+    if recent.get("p95_latency_ms") is not None and recent["p95_latency_ms"] >= LLM_WARN_P95_MS:
+        warnings.append(f"LLM p95 latency {recent['p95_latency_ms']}ms")
+
+    if event_store_saturated:
+        failing.append("event store buffer full")
+
+    if not caches.get("warm"):
+        failing.append("startup not complete")
+
+    disk = disk_check(uploads_dir)
+    if not disk["ok"]:
+        failing.append(f"only {disk['free_mb']}MB free for uploads")
+
+    ready = not failing
+    return ready, {
+        "status": "ready" if ready else "not_ready",
+        "failing": failing,
+        "warnings": warnings,
+        "checks": {
+            "event_loop": loop,
+            "llm_admission": admission,
+            "llm": llm,
+            "event_store": {"saturated": event_store_saturated, "ok": not event_store_saturated},
+            "caches": caches,
+            "uploads_disk": disk
+        }
+    }
+
+
+# Shared monitor for this process
+event_loop_monitor = EventLoopMonitor()
@@ -0,0 +1,193 @@
+"""
+Video Recommendation Index
+Curated videos read from the skill catalog by canonical skill and difficulty tier,
+with a TF-IDF similarity index so skills without curated content (e.g. FastAPI)
+borrow the videos of the nearest curated skill
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from analysis_engine import AVERAGE_THRESHOLD, score_bucket
+from assessment_cache import SKILL_MAPPING, VIDEO_RECOMMENDATIONS
+
+TIERS = ["beginner", "intermediate", "advanced"]
+
+# Every WEAK skill gets curated videos; the tier comes from where its score bucket falls in that range
+VIDEO_SCORE_THRESHOLD = AVERAGE_THRESHOLD
+
+# Minimum cosine similarity for an unknown skill to borrow a curated skill's videos
+MIN_SIMILARITY = 0.6
+
+# Related technologies and topics that describe each curated skill for similarity lookup
+SKILL_PROFILES = {
+    "Python": [
+        "python programming", "django", "flask", "fastapi", "pandas", "numpy", "scipy",
+        "pytest", "jupyter", "data science", "machine learning", "scripting", "automation"
+    ],
+    "JavaScript": [
+        "javascript", "ecmascript", "es6", "typescript", "node", "nodejs", "express",
+        "npm", "dom", "vue", "angular", "jquery", "frontend development", "web development"
+    ],
+    "React": [
+        "reactjs", "react hooks", "jsx", "redux", "nextjs", "next", "react native",
+        "ui components", "single page application", "state management"
+    ],
+    "SQL": [
+        "mysql", "postgresql", "postgres", "sqlite", "oracle database", "sql server",
+        "t-sql", "pl/sql", "database", "relational database", "rdbms", "queries", "data modeling"
+    ],
+}
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9+#]+", text.lower())
+
+
+def _features(text: str) -> Counter:
+    """Word tokens plus character trigrams, so close spellings still overlap"""
+    features = Counter()
+    for token in _tokens(text):
+        features["w:" + token] += 1
+        padded = f"^{token}$"
+        for i in range(len(padded) - 2):
+            features["c:" + padded[i:i+3]] += 1
+    return features
+
+
+def _normalize(vector: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {feature: weight / norm for feature, weight in vector.items()} if norm else {}
+
+
+class RecommendationIndex:
+    """Curated videos are decoded from the catalog per lookup; the similarity index is built on
+    the first lookup of a skill without curated videos, then queried with a sparse dot product"""
+
+    def __init__(self, videos: Mapping[str, List[Dict]], aliases: Dict[str, str], profiles: Dict[str, List[str]]):
+        # Only the curated skill names are read here, not their videos
+        self.aliases = dict(aliases)
+        for skill in videos:
+            self.aliases.setdefault(skill.lower(), skill)
+        self._videos = videos
+        self._profiles = profiles
+        self._lock = threading.Lock()
+        self.idf: Optional[Dict[str, float]] = None
+        self.postings: Dict[str, List[Tuple[int, str, float]]] = {}
+        self.nearest = lru_cache(maxsize=4096)(self._nearest)
+
+    def _build_similarity(self):
+        # One TF-IDF document per descriptive term (skill name, alias or profile phrase);
+        # short documents keep an exact term match near similarity 1
+        terms = {}
+        for alias, skill in self.aliases.items():
+            terms[alias] = skill
+        for skill, phrases in self._profiles.items():
+            for phrase in phrases:
+                terms.setdefault(phrase.lower(), skill)
+        documents = [(skill, _features(term)) for term, skill in terms.items()]
+
+        document_frequency = Counter()
+        for _, features in documents:
+            document_frequency.update(features.keys())
+        total = len(documents)
+        idf = {
+            feature: math.log((1 + total) / (1 + count)) + 1
+            for feature, count in document_frequency.items()
+        }
+
+        # Inverted index: feature -> [(term number, curated skill, weight)]
+        for number, (skill, features) in enumerate(documents):
+            vector = _normalize({feature: count * idf[feature] for feature, count in features.items()})
+            for feature, weight in vector.items():
+                self.postings.setdefault(feature, []).append((number, skill, weight))
+        # Published last: a reader that sees idf also sees the finished postings
+        self.idf = idf
+
+    def canonical(self, skill: str) -> Optional[str]:
+        """Curated skill for an exact name or known alias"""
+        return self.aliases.get(skill.strip().lower())
+
+    def similar(self, skill: str, limit: int = 3) -> List[Tuple[str, float]]:
+        """Curated skills ranked by cosine similarity to the given skill name"""
+        if self.idf is None:
+            with self._lock:
+                if self.idf is None:
+                    self._build_similarity()
+        query = _normalize({
+            feature: count * self.idf[feature]
+            for feature, count in _features(skill).items() if feature in self.idf
+        })
+        term_scores = Counter()
+        term_skills = {}
+        for feature, weight in query.items():
+            for number, curated, curated_weight in self.postings[feature]:
+                term_scores[number] += weight * curated_weight
+                term_skills[number] = curated
+        # A curated skill scores as well as its best matching term
+        best: Dict[str, float] = {}
+        for number, score in term_scores.items():
+            curated = term_skills[number]
+            best[curated] = max(best.get(curated, 0.0), score)
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        return [(curated, round(score, 3)) for curated, score in ranked[:limit]]
+
+    def _nearest(self, skill_lower: str) -> Optional[Tuple[str, float]]:
+        """Most similar curated skill if it is similar enough (memoized per skill name)"""
+        ranked = self.similar(skill_lower, limit=1)
+        if ranked and ranked[0][1] >= MIN_SIMILARITY:
+            return ranked[0]
+        return None
+
+    def videos_for(self, skill: str, tier: str = "beginner") -> List[Dict]:
+        """Videos for a curated skill, the requested tier first (a tier search when none is curated)"""
+        # Curated videos without a tier are for beginners
+        tiers = {}
+        for video in self._videos.get(skill, ()):
+            tiers.setdefault(video.get("tier", "beginner"), []).append(video)
+        ordered = [tier] + [other for other in TIERS if other != tier]
+        videos = [video for level in ordered for video in tiers.get(level, ())]
+        if skill in self._videos and not tiers.get(tier):
+            videos.insert(0, search_fallback(skill, tier))
+        return videos
+
+
+def tier_for_score(score: float) -> str:
+    """Content tier for a weak score: the WEAK range is split evenly across the tiers by score
+    bucket, so scores closest to passing get the most advanced material"""
+    width = VIDEO_SCORE_THRESHOLD / len(TIERS)
+    return TIERS[min(len(TIERS) - 1, int(score_bucket(score) // width))]
+
+
+def search_fallback(skill: str, tier: str = "beginner") -> Dict:
+    return {
+        "video_title": f"Learn {skill} - {tier.title()} Tutorial",
+        "video_url": f"https://www.youtube.com/results?search_query={skill}+tutorial+{tier}",
+        "description": f"{tier.title()} tutorial to improve your {skill} skills"
+    }
+
+
+# Shared index for this process
+recommendation_index = RecommendationIndex(VIDEO_RECOMMENDATIONS, SKILL_MAPPING, SKILL_PROFILES)
+
+
+def get_video_recommendations(skill: str, score: float) -> List[Dict]:
+    """Get curated video recommendations for a skill"""
+    canonical = recommendation_index.canonical(skill)
+    if canonical:
+        # Curated skill: recommend videos only for low scores
+        if score < VIDEO_SCORE_THRESHOLD:
+            return recommendation_index.videos_for(canonical, tier_for_score(score))
+        return []
+
+    match = recommendation_index.nearest(skill.strip().lower())
+    if match and score < VIDEO_SCORE_THRESHOLD:
+        # Related curated content first, then a search for the skill itself
+        return recommendation_index.videos_for(match[0], tier_for_score(score)) + [search_fallback(skill, tier_for_score(score))]
+
+    # Fallback for unknown skills
+    return [search_fallback(skill, tier_for_score(min(score, VIDEO_SCORE_THRESHOLD - 1)))]
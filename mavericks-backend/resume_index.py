@@ -0,0 +1,160 @@
+"""
+Resume Near-Duplicate Index
+MinHash signatures with LSH banding over shingled resume text, so re-uploads and
+lightly edited copies are recognized and reuse the earlier analysis
+"""
+
+import os
+import random
+import re
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
+
+# 128 signature slots split into 16 bands of 8 rows: pairs above ~0.7 Jaccard
+# similarity almost always share a band, pairs below ~0.4 almost never do
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+
+# Estimated similarity at which a resume counts as a duplicate of an earlier one
+DUPLICATE_THRESHOLD = float(os.getenv("RESUME_DUPLICATE_THRESHOLD", "0.85"))
+
+# Word shingle size and how many resumes to remember
+SHINGLE_SIZE = 5
+MAX_INDEXED_RESUMES = int(os.getenv("RESUME_INDEX_MAX", "50000"))
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(1729)
+_HASH_A = _rng.randrange(1, _MERSENNE_PRIME)
+_HASH_B = _rng.randrange(0, _MERSENNE_PRIME)
+_EMPTY = _MAX_HASH + 1
+
+
+class DuplicateMatch(NamedTuple):
+    resume_id: str
+    similarity: float
+    result: Dict
+
+
+def shingles(text: str) -> set:
+    """Hashed word shingles of normalized text"""
+    words = re.findall(r"[a-z0-9+#]+", text.lower())
+    if len(words) < SHINGLE_SIZE:
+        words = words + [""] * (SHINGLE_SIZE - len(words))
+    return {
+        zlib.crc32(" ".join(words[i:i + SHINGLE_SIZE]).encode("utf-8"))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(text: str) -> array:
+    """One-permutation MinHash signature: NUM_PERMUTATIONS 32-bit values, constant size per resume.
+
+    Each shingle is hashed once and kept only if it is the smallest in its slot, so the cost is
+    one hash per shingle rather than one per shingle and slot. Empty slots copy the next filled
+    one (densification), so short texts still compare slot by slot"""
+    slots = [_EMPTY] * NUM_PERMUTATIONS
+    for value in shingles(text):
+        hashed = (_HASH_A * value + _HASH_B) % _MERSENNE_PRIME
+        slot = hashed % NUM_PERMUTATIONS
+        hashed = (hashed // NUM_PERMUTATIONS) & _MAX_HASH
+        if hashed < slots[slot]:
+            slots[slot] = hashed
+    filled = [i for i, value in enumerate(slots) if value != _EMPTY]
+    if len(filled) < NUM_PERMUTATIONS:
+        for i in range(NUM_PERMUTATIONS):
+            if slots[i] == _EMPTY:
+                # Nearest filled slot to the right, wrapping around
+                slots[i] = slots[next((j for j in filled if j > i), filled[0])]
+    return array("I", slots)
+
+
+def estimated_similarity(first: array, second: array) -> float:
+    """Fraction of equal signature slots, an estimate of Jaccard similarity"""
+    return sum(x == y for x, y in zip(first, second)) / NUM_PERMUTATIONS
+
+
+class ResumeIndex:
+    """Exact digests plus LSH buckets over MinHash signatures, bounded FIFO"""
+
+    def __init__(self, max_resumes: int = MAX_INDEXED_RESUMES):
+        self.max_resumes = max_resumes
+        self._lock = threading.Lock()
+        self._signatures: "OrderedDict[str, array]" = OrderedDict()
+        self._results: Dict[str, Dict] = {}
+        self._digests: Dict[str, str] = {}
+        self._digest_of: Dict[str, str] = {}
+        self._bands: List[Dict[bytes, List[str]]] = [{} for _ in range(LSH_BANDS)]
+        self.exact_hits = 0
+        self.near_hits = 0
+
+    @staticmethod
+    def _band_keys(signature: array) -> List[bytes]:
+        return [signature[i * LSH_ROWS:(i + 1) * LSH_ROWS].tobytes() for i in range(LSH_BANDS)]
+
+    def find_exact(self, digest: str) -> Optional[DuplicateMatch]:
+        """Resume whose raw file bytes had this digest"""
+        with self._lock:
+            resume_id = self._digests.get(digest)
+            if resume_id is None:
+                return None
+            self.exact_hits += 1
+            return DuplicateMatch(resume_id, 1.0, self._results[resume_id])
+
+    def find_similar(self, signature: array) -> Optional[DuplicateMatch]:
+        """Most similar indexed resume above DUPLICATE_THRESHOLD, checking only LSH candidates"""
+        with self._lock:
+            candidates = set()
+            for band, key in zip(self._bands, self._band_keys(signature)):
+                candidates.update(band.get(key, ()))
+            best = None
+            for resume_id in candidates:
+                similarity = estimated_similarity(signature, self._signatures[resume_id])
+                if similarity >= DUPLICATE_THRESHOLD and (best is None or similarity > best[1]):
+                    best = (resume_id, similarity)
+            if best is None:
+                return None
+            self.near_hits += 1
+            return DuplicateMatch(best[0], round(best[1], 3), self._results[best[0]])
+
+    def add(self, resume_id: str, signature: array, result: Dict, digest: Optional[str] = None):
+        """Index a processed resume and the result to reuse for its duplicates"""
+        with self._lock:
+            self._signatures[resume_id] = signature
+            self._results[resume_id] = result
+            if digest:
+                self._digests[digest] = resume_id
+                self._digest_of[resume_id] = digest
+            for band, key in zip(self._bands, self._band_keys(signature)):
+                band.setdefault(key, []).append(resume_id)
+            while len(self._signatures) > self.max_resumes:
+                self._evict_oldest()
+
+    def _evict_oldest(self):
+        resume_id, signature = self._signatures.popitem(last=False)
+        del self._results[resume_id]
+        digest = self._digest_of.pop(resume_id, None)
+        if digest:
+            self._digests.pop(digest, None)
+        for band, key in zip(self._bands, self._band_keys(signature)):
+            bucket = band.get(key)
+            if bucket:
+                bucket.remove(resume_id)
+                if not bucket:
+                    del band[key]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "indexed": len(self._signatures),
+                "exact_hits": self.exact_hits,
+                "near_duplicate_hits": self.near_hits
+            }
+
+
+# Shared index for this process
+resume_index = ResumeIndex()
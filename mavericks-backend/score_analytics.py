@@ -0,0 +1,143 @@
+"""
+Score Analytics
+Streaming per-skill, per-difficulty statistics over graded submissions, kept in
+constant memory with mergeable histogram sketches so admin dashboards never scan
+raw history
+"""
+
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# A skill score at or above this counts as a pass
+PASS_SCORE = float(os.getenv("PASS_SCORE", "60"))
+
+# Scores are percentages; one bin per point gives quantiles accurate to +/- 0.5
+SKETCH_BINS = 101
+
+
+class ScoreSketch:
+    """Fixed-bin histogram over 0-100: O(1) updates, exact count/mean, mergeable by addition"""
+
+    __slots__ = ("bins", "count", "total", "passed")
+
+    def __init__(self):
+        self.bins = [0] * SKETCH_BINS
+        self.count = 0
+        self.total = 0.0
+        self.passed = 0
+
+    def add(self, score: float):
+        score = min(100.0, max(0.0, float(score)))
+        self.bins[int(round(score))] += 1
+        self.count += 1
+        self.total += score
+        if score >= PASS_SCORE:
+            self.passed += 1
+
+    def merge(self, other: "ScoreSketch"):
+        """Fold another sketch into this one (e.g. across skills or workers)"""
+        for i, value in enumerate(other.bins):
+            if value:
+                self.bins[i] += value
+        self.count += other.count
+        self.total += other.total
+        self.passed += other.passed
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0 <= q <= 1), or None when empty"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for score, value in enumerate(self.bins):
+            seen += value
+            if seen >= rank:
+                return float(score)
+        return 100.0
+
+    def summary(self) -> Dict:
+        if not self.count:
+            return {"count": 0, "mean": None, "p50": None, "p90": None, "pass_rate": None}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1),
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "pass_rate": round(self.passed / self.count, 3)
+        }
+
+
+class ScoreAnalytics:
+    """Running score sketches keyed by (skill, difficulty)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sketches: Dict[Tuple[str, str], ScoreSketch] = {}
+        self._overall: Dict[str, ScoreSketch] = {}
+        self._skill_names: Dict[str, str] = {}
+        self.started_at = int(time.time())
+
+    def record(self, skill_scores: Dict[str, Dict], overall_score: float, difficulty: str = "intermediate"):
+        """Fold one graded submission into the running stats"""
+        difficulty = (difficulty or "intermediate").lower()
+        with self._lock:
+            for skill, result in skill_scores.items():
+                key = skill.strip().lower()
+                self._skill_names.setdefault(key, skill.strip())
+                sketch = self._sketches.get((key, difficulty))
+                if sketch is None:
+                    sketch = ScoreSketch()
+                    self._sketches[(key, difficulty)] = sketch
+                sketch.add(result["score"])
+            self._overall.setdefault(difficulty, ScoreSketch()).add(overall_score)
+
+    def report(self, skill: Optional[str] = None, difficulty: Optional[str] = None) -> Dict:
+        """Summaries per skill and difficulty, optionally filtered"""
+        skill_key = skill.strip().lower() if skill else None
+        difficulty = difficulty.lower() if difficulty else None
+        skills: Dict[str, Dict] = {}
+        with self._lock:
+            for (key, level), sketch in self._sketches.items():
+                if (skill_key and key != skill_key) or (difficulty and level != difficulty):
+                    continue
+                entry = skills.setdefault(self._skill_names[key], {"all": ScoreSketch(), "by_difficulty": {}})
+                entry["all"].merge(sketch)
+                entry["by_difficulty"][level] = sketch.summary()
+            overall = ScoreSketch()
+            for level, sketch in self._overall.items():
+                if not difficulty or level == difficulty:
+                    overall.merge(sketch)
+
+        return {
+            "since": self.started_at,
+            "pass_score": PASS_SCORE,
+            "overall": overall.summary(),
+            "skills": {
+                name: dict(entry["all"].summary(), by_difficulty=entry["by_difficulty"])
+                for name, entry in sorted(skills.items(), key=lambda item: item[0].lower())
+            }
+        }
+
+    def weakest_skills(self, limit: int = 5, min_count: int = 5, skill: Optional[str] = None,
+                       difficulty: Optional[str] = None) -> List[Dict]:
+        """Skills with the lowest mean score, optionally filtered like report()"""
+        skill_key = skill.strip().lower() if skill else None
+        difficulty = difficulty.lower() if difficulty else None
+        merged: Dict[str, ScoreSketch] = {}
+        with self._lock:
+            for (key, level), sketch in self._sketches.items():
+                if (skill_key and key != skill_key) or (difficulty and level != difficulty):
+                    continue
+                merged.setdefault(key, ScoreSketch()).merge(sketch)
+            names = dict(self._skill_names)
+        ranked = sorted(
+            (sketch.total / sketch.count, key) for key, sketch in merged.items() if sketch.count >= min_count
+        )
+        return [dict(merged[key].summary(), skill=names[key]) for _, key in ranked[:limit]]
+
+
+# Shared analytics for this process
+score_analytics = ScoreAnalytics()
@@ -0,0 +1,284 @@
+"""
+Shared Memory Cache
+A fixed-size, set-associative hash table in a memory-mapped file that every worker
+process on the host maps, so an entry cached by one worker is a hit for all of them.
+Reads are lock-free (per-slot sequence counters); writes lock only their bucket
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Byte-range file locks are POSIX-only; callers fall back to a per-process cache without them
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+SHARED_CACHE_DIR = os.getenv(
+    "SHARED_CACHE_DIR",
+    "/dev/shm" if os.path.isdir("/dev/shm") else os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+)
+
+# File layout: header, one counter row per process, then buckets of WAYS fixed-size slots
+_MAGIC = b"MVSC"
+_LAYOUT_VERSION = 1
+_HEADER = struct.Struct("<4sIIII")        # magic, layout version, buckets, ways, slot bytes
+_ROW = struct.Struct("<qQQQQQ")           # pid, hits, misses, stores, evictions, oversized
+_SLOT = struct.Struct("<QQddII")          # sequence, key hash, created, last used, key length, value length
+_ROWS_OFFSET = 64
+_ROW_BYTES = 64
+MAX_PROCESS_ROWS = 64
+_SLOTS_OFFSET = 8192
+_COUNTERS = ("hits", "misses", "stores", "evictions", "oversized")
+
+# A read that keeps racing a writer gives up and counts as a miss
+_READ_RETRIES = 16
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedMemoryCache:
+    """Host-wide key -> bytes cache with a TTL, per-bucket LRU eviction and host-wide counters"""
+
+    def __init__(self, path: str, buckets: int, ways: int, slot_bytes: int, ttl_seconds: float):
+        self.buckets = buckets
+        self.ways = ways
+        self.slot_bytes = slot_bytes
+        self.ttl_seconds = ttl_seconds
+        self.capacity = buckets * ways
+        # The geometry is part of the file name, so differently configured deployments never share a file
+        self.path = f"{path}.v{_LAYOUT_VERSION}.{buckets}x{ways}x{slot_bytes}"
+        self._size = _SLOTS_OFFSET + self.capacity * slot_bytes
+        # lockf excludes other processes; these exclude the other threads of this one
+        self._bucket_locks = [threading.Lock() for _ in range(buckets)]
+        self._row_lock = threading.Lock()
+        self._row: Optional[int] = None
+        self._row_pid: Optional[int] = None
+        self._local = dict.fromkeys(_COUNTERS, 0)
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._initialize()
+        self._mm = mmap.mmap(self._fd, self._size)
+
+    # --- File setup and locking ---
+
+    @contextmanager
+    def _file_lock(self, start: int, length: int):
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+    def _initialize(self):
+        """Size the file and write its header; the first process to get here does the work"""
+        expected = _HEADER.pack(_MAGIC, _LAYOUT_VERSION, self.buckets, self.ways, self.slot_bytes)
+        with self._file_lock(0, _ROWS_OFFSET):
+            if os.fstat(self._fd).st_size < self._size:
+                os.ftruncate(self._fd, self._size)
+            if os.pread(self._fd, _HEADER.size, 0) != expected:
+                os.pwrite(self._fd, b"\0" * (_SLOTS_OFFSET + self.capacity * self.slot_bytes), 0)
+                os.pwrite(self._fd, expected, 0)
+                print(f"🧠 Created shared cache {self.path} ({self._size // (1024 * 1024)} MB, {self.capacity} slots)")
+
+    @contextmanager
+    def _bucket_lock(self, bucket: int):
+        with self._bucket_locks[bucket]:
+            with self._file_lock(self._slot_offset(bucket * self.ways), self.ways * self.slot_bytes):
+                yield
+
+    def _slot_offset(self, index: int) -> int:
+        return _SLOTS_OFFSET + index * self.slot_bytes
+
+    @staticmethod
+    def _hash(key: bytes) -> int:
+        # Never 0, so an empty slot cannot match a key
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+    # --- Counters: one row per process, written only by that process ---
+
+    def _claim_row(self) -> Optional[int]:
+        pid = os.getpid()
+        if self._row_pid == pid:
+            return self._row
+        # First use in this process (or in a freshly forked worker): reuse our row, a free one or a dead process's
+        self._row, self._row_pid = None, pid
+        with self._file_lock(_ROWS_OFFSET, MAX_PROCESS_ROWS * _ROW_BYTES):
+            free = None
+            for row in range(MAX_PROCESS_ROWS):
+                owner = struct.unpack_from("<q", self._mm, _ROWS_OFFSET + row * _ROW_BYTES)[0]
+                if owner == pid:
+                    self._row = row
+                    return row
+                if free is None and (owner == 0 or not _pid_alive(owner)):
+                    free = row
+            if free is not None:
+                # A dead process's counts stay in the row, so host totals survive worker restarts
+                struct.pack_into("<q", self._mm, _ROWS_OFFSET + free * _ROW_BYTES, pid)
+                self._row = free
+        return self._row
+
+    def _count(self, counter: str):
+        with self._row_lock:
+            self._local[counter] += 1
+            row = self._claim_row()
+            if row is None:
+                return
+            offset = _ROWS_OFFSET + row * _ROW_BYTES + 8 + _COUNTERS.index(counter) * 8
+            struct.pack_into("<Q", self._mm, offset, struct.unpack_from("<Q", self._mm, offset)[0] + 1)
+
+    # --- Slots ---
+
+    def _read_slot(self, offset: int, key_hash: Optional[int] = None,
+                   known_created: Optional[float] = None) -> Optional[Tuple[bytes, float, Optional[bytes]]]:
+        """(key, created, value) from a consistent snapshot of a slot; value is None when created == known_created"""
+        payload_limit = self.slot_bytes - _SLOT.size
+        for _ in range(_READ_RETRIES):
+            sequence, slot_hash, created, _, key_length, value_length = _SLOT.unpack_from(self._mm, offset)
+            if sequence & 1:
+                # A writer is mid-update
+                time.sleep(0)
+                continue
+            if key_length == 0 or (key_hash is not None and slot_hash != key_hash):
+                return None
+            if key_length + value_length > payload_limit:
+                continue
+            start = offset + _SLOT.size
+            key = self._mm[start:start + key_length]
+            value = None
+            if created != known_created:
+                value = self._mm[start + key_length:start + key_length + value_length]
+            if struct.unpack_from("<Q", self._mm, offset)[0] == sequence:
+                return key, created, value
+        return None
+
+    def get(self, key: str, known_created: Optional[float] = None) -> Tuple[Optional[float], Optional[bytes]]:
+        """(created, value) for a live entry, (None, None) on a miss.
+
+        Pass the created time of a copy the caller already holds; when it is still current
+        the value is not copied out and (created, None) is returned."""
+        key_bytes = key.encode("utf-8")
+        key_hash = self._hash(key_bytes)
+        bucket = key_hash % self.buckets
+        now = time.time()
+        for way in range(self.ways):
+            offset = self._slot_offset(bucket * self.ways + way)
+            slot = self._read_slot(offset, key_hash, known_created)
+            if slot is None or slot[0] != key_bytes:
+                continue
+            _, created, value = slot
+            if now - created >= self.ttl_seconds:
+                break
+            # Unlocked recency update; a lost race only makes eviction slightly less exact
+            struct.pack_into("<d", self._mm, offset + 24, now)
+            self._count("hits")
+            return created, value
+        self._count("misses")
+        return None, None
+
+    def put(self, key: str, value: bytes, created: Optional[float] = None) -> bool:
+        """Store an entry, evicting the least recently used one in its bucket; False if it does not fit a slot"""
+        key_bytes = key.encode("utf-8")
+        if len(key_bytes) + len(value) > self.slot_bytes - _SLOT.size:
+            self._count("oversized")
+            return False
+        created = time.time() if created is None else created
+        key_hash = self._hash(key_bytes)
+        bucket = key_hash % self.buckets
+        with self._bucket_lock(bucket):
+            victim, victim_rank, evicted = None, None, False
+            for way in range(self.ways):
+                offset = self._slot_offset(bucket * self.ways + way)
+                sequence, slot_hash, slot_created, last_used, key_length, _ = _SLOT.unpack_from(self._mm, offset)
+                start = offset + _SLOT.size
+                if key_length and slot_hash == key_hash and self._mm[start:start + key_length] == key_bytes:
+                    victim, evicted = offset, False
+                    break
+                # Prefer an empty slot, then an expired one, then the least recently used
+                if key_length == 0:
+                    rank = (0, 0.0)
+                elif created - slot_created >= self.ttl_seconds:
+                    rank = (1, last_used)
+                else:
+                    rank = (2, last_used)
+                if victim_rank is None or rank < victim_rank:
+                    victim, victim_rank, evicted = offset, rank, rank[0] == 2
+
+            sequence = struct.unpack_from("<Q", self._mm, victim)[0]
+            # Odd sequence while writing: readers retry until it is even again
+            struct.pack_into("<Q", self._mm, victim, sequence + 1)
+            _SLOT.pack_into(self._mm, victim, sequence + 1, key_hash, created, created, len(key_bytes), len(value))
+            start = victim + _SLOT.size
+            self._mm[start:start + len(key_bytes)] = key_bytes
+            self._mm[start + len(key_bytes):start + len(key_bytes) + len(value)] = value
+            struct.pack_into("<Q", self._mm, victim, sequence + 2)
+        self._count("stores")
+        if evicted:
+            self._count("evictions")
+        return True
+
+    def items(self) -> List[Tuple[str, float, bytes]]:
+        """Every live entry as (key, created, value)"""
+        now = time.time()
+        found = []
+        for index in range(self.capacity):
+            slot = self._read_slot(self._slot_offset(index))
+            if slot is not None and now - slot[1] < self.ttl_seconds:
+                found.append((slot[0].decode("utf-8"), slot[1], slot[2]))
+        return found
+
+    def stats(self) -> Dict:
+        now = time.time()
+        totals = dict.fromkeys(_COUNTERS, 0)
+        processes = 0
+        for row in range(MAX_PROCESS_ROWS):
+            pid, *counts = _ROW.unpack_from(self._mm, _ROWS_OFFSET + row * _ROW_BYTES)
+            if pid and _pid_alive(pid):
+                processes += 1
+            for name, count in zip(_COUNTERS, counts):
+                totals[name] += count
+        entries = 0
+        for index in range(self.capacity):
+            _, _, created, _, key_length, _ = _SLOT.unpack_from(self._mm, self._slot_offset(index))
+            if key_length and now - created < self.ttl_seconds:
+                entries += 1
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "backend": "shared_memory",
+            "entries": entries,
+            "capacity": self.capacity,
+            "processes": processes,
+            "host": dict(totals, hit_rate=round(totals["hits"] / lookups, 3) if lookups else None),
+            "this_process": dict(self._local)
+        }
+
+
+def open_shared_cache(name: str, buckets: int, ways: int, slot_bytes: int,
+                      ttl_seconds: float) -> Optional[SharedMemoryCache]:
+    """Open (or create) the host-wide cache called name; None where shared memory is unavailable"""
+    if fcntl is None:
+        return None
+    # One file per checkout, so two deployments on the same host do not share entries
+    checkout = zlib.crc32(os.path.dirname(os.path.abspath(__file__)).encode("utf-8"))
+    path = os.path.join(SHARED_CACHE_DIR, f"mavericks-{name}-{checkout:08x}")
+    try:
+        return SharedMemoryCache(path, buckets, ways, slot_bytes, ttl_seconds)
+    except OSError as e:
+        print(f"⚠️ Shared {name} cache unavailable ({e}) - using a per-process cache")
+        return None
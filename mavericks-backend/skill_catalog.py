@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Compiled Skill Catalog
+The predefined assessments, curated videos, skill patterns and aliases are compiled
+from skill_catalog.json into one offset-indexed binary file that every worker
+memory-maps: opening reads only the header, records are decoded on access, and the
+pages are shared through the OS page cache. The skill matcher's term table and
+trigram index are derived at compile time and stored as sections of their own
+
+    python skill_catalog.py    # compile skill_catalog.json into data/skill_catalog.bin
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+SKILL_CATALOG_SOURCE = os.getenv("SKILL_CATALOG_SOURCE", os.path.join(_HERE, "skill_catalog.json"))
+SKILL_CATALOG_PATH = os.getenv("SKILL_CATALOG_PATH", os.path.join(_HERE, "data", "skill_catalog.bin"))
+
+# File layout: header, section directory, per-section record arrays and hash tables, then key/value bytes
+_MAGIC = b"MVCT"
+_FORMAT_VERSION = 2
+_HEADER = struct.Struct("<4sHHQq")        # magic, format version, sections, source size, source mtime (ns)
+_DIRECTORY = struct.Struct("<32sIIII")    # section name, records, records offset, table offset, table slots
+_RECORD = struct.Struct("<IIII")          # key offset, key length, value offset, value length
+_TABLE_SLOT = struct.Struct("<QI")        # key hash, record number + 1 (0 = empty)
+
+# Single-word taxonomy terms at least this long go into the fuzzy-matching trigram index
+TRIGRAM_INDEX_MIN_LENGTH = 4
+
+
+def _hash(key: bytes) -> int:
+    # Never 0, so it cannot be confused with an empty slot
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+
+def _table_slots(records: int) -> int:
+    """Power of two at least twice the record count, so probe chains stay short"""
+    slots = 1
+    while slots < records * 2:
+        slots *= 2
+    return slots
+
+
+def _source_stamp(source: str) -> Tuple[int, int]:
+    stat = os.stat(source)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def trigrams(term: str) -> Set[str]:
+    padded = f"^{term}$"
+    return {padded[i:i+3] for i in range(len(padded) - 2)}
+
+
+def derive_sections(catalog: Dict[str, Dict]) -> Dict[str, Dict]:
+    """The source sections plus the skill matcher's lookup tables: every accepted spelling ->
+    taxonomy term, and trigram -> single-word terms containing it"""
+    terms = {}
+    for skills in catalog["skill_patterns"].values():
+        for skill in skills:
+            terms[skill.lower()] = skill.lower()
+    for alias, term in catalog["skill_aliases"].items():
+        terms.setdefault(alias, term)
+
+    trigram_index: Dict[str, List[str]] = {}
+    for term in sorted(set(terms.values())):
+        if " " in term or len(term) < TRIGRAM_INDEX_MIN_LENGTH:
+            continue
+        for gram in sorted(trigrams(term)):
+            trigram_index.setdefault(gram, []).append(term)
+    return dict(catalog, skill_terms=terms, skill_trigrams=trigram_index)
+
+
+def compile_catalog(catalog: Dict[str, Dict], output: str, stamp: Tuple[int, int] = (0, 0)) -> Dict[str, int]:
+    """Write the sections of catalog (name -> {key: JSON value}) as a compiled catalog file"""
+    sections = list(catalog.items())
+    offset = _HEADER.size + _DIRECTORY.size * len(sections)
+    layout = []
+    for _, entries in sections:
+        slots = _table_slots(len(entries))
+        layout.append((offset, offset + _RECORD.size * len(entries), slots))
+        offset += _RECORD.size * len(entries) + _TABLE_SLOT.size * slots
+
+    buffer = bytearray(offset)
+    _HEADER.pack_into(buffer, 0, _MAGIC, _FORMAT_VERSION, len(sections), *stamp)
+    for number, ((name, entries), (records_offset, table_offset, slots)) in enumerate(zip(sections, layout)):
+        _DIRECTORY.pack_into(buffer, _HEADER.size + number * _DIRECTORY.size,
+                             name.encode("utf-8"), len(entries), records_offset, table_offset, slots)
+        for index, (key, value) in enumerate(entries.items()):
+            key_bytes = key.encode("utf-8")
+            value_bytes = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            key_offset = len(buffer)
+            buffer += key_bytes
+            buffer += value_bytes
+            _RECORD.pack_into(buffer, records_offset + index * _RECORD.size,
+                              key_offset, len(key_bytes), key_offset + len(key_bytes), len(value_bytes))
+            # Linear probing into the section's hash table
+            key_hash = _hash(key_bytes)
+            slot = key_hash & (slots - 1)
+            while _TABLE_SLOT.unpack_from(buffer, table_offset + slot * _TABLE_SLOT.size)[1]:
+                slot = (slot + 1) & (slots - 1)
+            _TABLE_SLOT.pack_into(buffer, table_offset + slot * _TABLE_SLOT.size, key_hash, index + 1)
+
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(buffer)
+    os.replace(tmp_path, output)
+    return {name: len(entries) for name, entries in sections}
+
+
+class CatalogSection(Mapping):
+    """Read-only mapping over one section of a mapped catalog; values are decoded on every access"""
+
+    def __init__(self, data: mmap.mmap, records: int, records_offset: int, table_offset: int, slots: int):
+        self._data = data
+        self._records = records
+        self._records_offset = records_offset
+        self._table_offset = table_offset
+        self._slots = slots
+
+    def _record(self, index: int) -> Tuple[int, int, int, int]:
+        return _RECORD.unpack_from(self._data, self._records_offset + index * _RECORD.size)
+
+    def _find(self, key: str) -> Optional[Tuple[int, int, int, int]]:
+        if not isinstance(key, str):
+            return None
+        key_bytes = key.encode("utf-8")
+        key_hash = _hash(key_bytes)
+        slot = key_hash & (self._slots - 1)
+        while True:
+            slot_hash, number = _TABLE_SLOT.unpack_from(self._data, self._table_offset + slot * _TABLE_SLOT.size)
+            if number == 0:
+                return None
+            if slot_hash == key_hash:
+                record = self._record(number - 1)
+                if self._data[record[0]:record[0] + record[1]] == key_bytes:
+                    return record
+            slot = (slot + 1) & (self._slots - 1)
+
+    def raw(self, key: str) -> bytes:
+        """Encoded JSON value for key, without decoding it"""
+        record = self._find(key)
+        if record is None:
+            raise KeyError(key)
+        return self._data[record[2]:record[2] + record[3]]
+
+    def __getitem__(self, key: str):
+        return json.loads(self.raw(key))
+
+    def get(self, key: str, default=None):
+        # One probe, no KeyError round trip: the skill matcher mostly looks up words that are not skills
+        record = self._find(key)
+        if record is None:
+            return default
+        return json.loads(self._data[record[2]:record[2] + record[3]])
+
+    def __contains__(self, key) -> bool:
+        return self._find(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        # Source order
+        for index in range(self._records):
+            key_offset, key_length, _, _ = self._record(index)
+            yield self._data[key_offset:key_offset + key_length].decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._records
+
+
+class CompiledCatalog:
+    """A memory-mapped compiled catalog; opening it reads only the header and section directory"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._data) < _HEADER.size:
+            raise ValueError(f"{path} is not a compiled skill catalog")
+        magic, version, count, size, mtime_ns = _HEADER.unpack_from(self._data, 0)
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {_FORMAT_VERSION} skill catalog")
+        self.path = path
+        self.source_stamp = (size, mtime_ns)
+        self._sections: Dict[str, CatalogSection] = {}
+        for number in range(count):
+            name, *location = _DIRECTORY.unpack_from(self._data, _HEADER.size + number * _DIRECTORY.size)
+            self._sections[name.rstrip(b"\0").decode("utf-8")] = CatalogSection(self._data, *location)
+
+    def section(self, name: str) -> CatalogSection:
+        return self._sections[name]
+
+    def stats(self) -> Dict:
+        return {
+            "format": "compiled",
+            "path": self.path,
+            "bytes": len(self._data),
+            "sections": {name: len(section) for name, section in self._sections.items()}
+        }
+
+
+class SourceCatalog:
+    """The parsed source JSON, used where the compiled file cannot be written"""
+
+    def __init__(self, catalog: Dict[str, Dict]):
+        self._sections = catalog
+
+    def section(self, name: str) -> Dict:
+        return self._sections[name]
+
+    def stats(self) -> Dict:
+        return {"format": "source", "sections": {name: len(section) for name, section in self._sections.items()}}
+
+
+def load_skill_catalog(source: str = SKILL_CATALOG_SOURCE, path: str = SKILL_CATALOG_PATH):
+    """Map the compiled catalog, compiling it first when it is missing or older than the source"""
+    stamp = _source_stamp(source)
+    try:
+        catalog = CompiledCatalog(path)
+        if catalog.source_stamp == stamp:
+            return catalog
+    except (OSError, ValueError):
+        pass
+
+    with open(source, "r", encoding="utf-8") as f:
+        parsed = derive_sections(json.load(f))
+    try:
+        counts = compile_catalog(parsed, path, stamp)
+        print(f"📦 Compiled skill catalog: {', '.join(f'{count} {name}' for name, count in counts.items())}")
+        return CompiledCatalog(path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not compile skill catalog ({e}) - using the source JSON in memory")
+        return SourceCatalog(parsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the skill catalog JSON into its memory-mapped form")
+    parser.add_argument("--source", default=SKILL_CATALOG_SOURCE)
+    parser.add_argument("--output", default=SKILL_CATALOG_PATH)
+    args = parser.parse_args()
+
+    with open(args.source, "r", encoding="utf-8") as f:
+        parsed = derive_sections(json.load(f))
+    counts = compile_catalog(parsed, args.output, _source_stamp(args.source))
+    print(f"✅ Compiled {', '.join(f'{count} {name}' for name, count in counts.items())}")
+    print(f"📁 Output: {args.output} ({os.path.getsize(args.output)} bytes)")
+
+
+# Shared catalog for this process
+skill_catalog = load_skill_catalog()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Skill Co-occurrence Graph
+Sparse counts of which skills appear together on analyzed resumes, updated per
+resume and snapshotted to disk, answering "commonly paired with" and "learn next"
+queries from memory. Each snapshot adds this process's new counts to the file, so
+several workers can share one graph
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+# Snapshots from different workers are serialized with a file lock (POSIX only)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+SKILL_GRAPH_PATH = os.getenv(
+    "SKILL_GRAPH_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skill_graph.json")
+)
+
+# Snapshot at most this often, and only when something changed
+SKILL_GRAPH_SNAPSHOT_SECONDS = float(os.getenv("SKILL_GRAPH_SNAPSHOT_SECONDS", "60"))
+
+# Pairs seen fewer times than this are too noisy to recommend
+MIN_PAIR_SUPPORT = int(os.getenv("SKILL_GRAPH_MIN_SUPPORT", "2"))
+
+
+def _empty_graph() -> Dict:
+    return {"resumes": 0, "counts": {}, "pairs": {}, "names": {}}
+
+
+def _merge_graph(graph: Dict, delta: Dict):
+    """Add the counts of delta into graph in place"""
+    graph["resumes"] += delta["resumes"]
+    for key, count in delta["counts"].items():
+        graph["counts"][key] = graph["counts"].get(key, 0) + count
+    for key, neighbours in delta["pairs"].items():
+        merged = graph["pairs"].setdefault(key, {})
+        for other, together in neighbours.items():
+            merged[other] = merged.get(other, 0) + together
+    for key, name in delta["names"].items():
+        graph["names"].setdefault(key, name)
+
+
+class SkillGraph:
+    """Per-skill resume counts and symmetric pair counts (adjacency dicts)"""
+
+    def __init__(self, path: str = SKILL_GRAPH_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.resumes = 0
+        self._counts: Dict[str, int] = {}
+        self._pairs: Dict[str, Dict[str, int]] = {}
+        self._names: Dict[str, str] = {}
+        # Counts added since the last snapshot, merged into the file by the next one
+        self._pending = _empty_graph()
+        self._snapshot_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_snapshot = None
+
+    @staticmethod
+    def _key(skill: str) -> str:
+        return skill.strip().lower()
+
+    def add_resume(self, skills: Iterable[str]):
+        """Count one resume's skills and every pair among them"""
+        delta = _empty_graph()
+        delta["resumes"] = 1
+        for skill in skills:
+            key = self._key(skill)
+            if key and key not in delta["counts"]:
+                delta["counts"][key] = 1
+                delta["names"][key] = skill.strip()
+        for key in delta["counts"]:
+            delta["pairs"][key] = {other: 1 for other in delta["counts"] if other != key}
+        with self._lock:
+            self._adopt(self._graph(), delta)
+            _merge_graph(self._pending, delta)
+
+    def _adopt(self, graph: Dict, delta: Optional[Dict] = None):
+        """Make graph (plus delta) the live counts"""
+        if delta is not None:
+            _merge_graph(graph, delta)
+        self.resumes = graph["resumes"]
+        self._counts = graph["counts"]
+        self._pairs = graph["pairs"]
+        self._names = graph["names"]
+
+    def _graph(self) -> Dict:
+        """The live counts as a graph dict (shares the underlying dicts)"""
+        return {"resumes": self.resumes, "counts": self._counts, "pairs": self._pairs, "names": self._names}
+
+    def _entry(self, skill: str, other: str, together: int) -> Dict:
+        confidence = together / self._counts[skill]
+        lift = confidence / (self._counts[other] / self.resumes)
+        return {
+            "skill": self._names[other],
+            "co_occurrences": together,
+            "confidence": round(confidence, 3),
+            "lift": round(lift, 2)
+        }
+
+    def related(self, skill: str, limit: int = 5) -> List[Dict]:
+        """Skills most often listed alongside skill (P(other | skill), ties by count)"""
+        key = self._key(skill)
+        with self._lock:
+            neighbours = self._pairs.get(key, {})
+            ranked = sorted(
+                (other for other, together in neighbours.items() if together >= MIN_PAIR_SUPPORT),
+                key=lambda other: (neighbours[other], self._counts[other]),
+                reverse=True
+            )
+            return [self._entry(key, other, neighbours[other]) for other in ranked[:limit]]
+
+    def next_skills(self, known_skills: Iterable[str], limit: int = 5) -> List[Dict]:
+        """Skills people with these skills usually also have, excluding the known ones"""
+        known = {self._key(skill) for skill in known_skills}
+        with self._lock:
+            scores: Dict[str, float] = {}
+            for key in known:
+                count = self._counts.get(key)
+                if not count:
+                    continue
+                for other, together in self._pairs[key].items():
+                    if other not in known and together >= MIN_PAIR_SUPPORT:
+                        scores[other] = scores.get(other, 0.0) + together / count
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+            return [
+                {"skill": self._names[other], "score": round(score / max(1, len(known)), 3)}
+                for other, score in ranked
+            ]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "resumes": self.resumes,
+                "skills": len(self._counts),
+                "pairs": sum(len(neighbours) for neighbours in self._pairs.values()) // 2,
+                "last_snapshot": self.last_snapshot
+            }
+
+    # --- Persistence ---
+
+    def _read(self) -> Optional[Dict]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.lockf(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.lockf(lock_file, fcntl.LOCK_UN)
+
+    def load(self):
+        """Restore the last snapshot, if any"""
+        try:
+            snapshot = self._read()
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load skill graph snapshot: {e}")
+            return
+        if snapshot is None:
+            return
+        with self._lock:
+            self._adopt(snapshot, self._pending)
+        print(f"🕸️ Loaded skill graph: {len(self._counts)} skills from {self.resumes} resumes")
+
+    def snapshot(self) -> bool:
+        """Add the counts recorded since the last snapshot to the file; False if there were none.
+
+        The file may also hold other workers' counts, so the merged graph becomes the live one"""
+        with self._snapshot_lock:
+            with self._lock:
+                if not self._pending["resumes"]:
+                    return False
+                pending, self._pending = self._pending, _empty_graph()
+            try:
+                with self._file_lock():
+                    try:
+                        graph = self._read() or _empty_graph()
+                    except ValueError as e:
+                        print(f"⚠️ Skill graph snapshot unreadable ({e}) - rewriting it")
+                        graph = _empty_graph()
+                    _merge_graph(graph, pending)
+                    encoded = json.dumps(graph, separators=(",", ":"))
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        f.write(encoded)
+                    os.replace(tmp_path, self.path)
+            except OSError:
+                # Keep the counts for the next attempt
+                with self._lock:
+                    _merge_graph(self._pending, pending)
+                raise
+            with self._lock:
+                # Counts added while the file was being written are still pending
+                self._adopt(graph, self._pending)
+        self.last_snapshot = int(time.time())
+        return True
+
+    def _run(self):
+        while not self._stop.wait(SKILL_GRAPH_SNAPSHOT_SECONDS):
+            try:
+                self.snapshot()
+            except OSError as e:
+                print(f"⚠️ Skill graph snapshot failed: {e}")
+
+    def start(self):
+        """Load the last snapshot and start periodic snapshots"""
+        if self._thread is not None:
+            return
+        self.load()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="skill-graph-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop periodic snapshots and write a final one"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.snapshot()
+
+
+# Shared graph for this process
+skill_graph = SkillGraph()
@@ -0,0 +1,175 @@
+"""
+Skill Matcher
+Finds taxonomy skills in resume text with one pass over the tokens: exact and alias
+lookups on token n-grams, then a character-trigram index for misspelled, versioned
+or PDF-mangled variants. Both tables are sections of the memory-mapped skill catalog,
+so they are read on demand rather than built by every process
+"""
+
+import re
+from collections import Counter
+from typing import List, Mapping, Optional, Set, Tuple
+
+from skill_catalog import skill_catalog, trigrams
+
+# Common technical skills patterns, by category (from the skill catalog)
+SKILL_PATTERNS = skill_catalog.section("skill_patterns")
+
+# Common spellings and abbreviations that should count as a taxonomy skill
+SKILL_ALIASES = skill_catalog.section("skill_aliases")
+
+# Display names that title() would get wrong
+DISPLAY_NAMES = {
+    'c++': 'C++',
+    'c#': 'C#',
+    'node.js': 'Node.js',
+    'nodejs': 'Node.js',
+    'machine learning': 'Machine Learning',
+    'deep learning': 'Deep Learning',
+    'sql': 'SQL',
+    'javascript': 'JavaScript',
+    'react': 'React',
+    'reactjs': 'React',
+    'react.js': 'React',
+}
+
+# Longest phrase (in tokens) looked up in the term table
+MAX_PHRASE_TOKENS = 3
+
+# Fuzzy matching: only tokens this long are considered (skills down to one character shorter
+# are in the catalog's trigram index). A candidate sharing trigrams is
+# accepted with a high Dice similarity, or with a low one if it is a single typo away
+FUZZY_MIN_LENGTH = 5
+FUZZY_THRESHOLD = 0.7
+FUZZY_CANDIDATE_THRESHOLD = 0.4
+# Shorter skills only accept swapped letters: one substitution turns "docker" into "docket"
+SINGLE_EDIT_MIN_LENGTH = 7
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+VERSION_SUFFIX = re.compile(r"[\-.]?v?\d+(\.\d+)*$")
+# Compound tokens are looked up part by part when the whole token is unknown
+TOKEN_PART_SEPARATORS = re.compile(r"[\-./]+")
+
+
+def display_name(term: str) -> str:
+    """Properly capitalized name for a taxonomy term"""
+    return DISPLAY_NAMES.get(term, term.title())
+
+
+def is_transposition(a: str, b: str) -> bool:
+    """True if b is a with two adjacent characters swapped"""
+    if len(a) != len(b):
+        return False
+    diff = [i for i in range(len(a)) if a[i] != b[i]]
+    return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """True if one insertion, deletion, substitution or adjacent swap turns a into b"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        return sum(x != y for x, y in zip(a, b)) <= 1 or is_transposition(a, b)
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    i = 0
+    while i < len(shorter) and shorter[i] == longer[i]:
+        i += 1
+    return shorter[i:] == longer[i + 1:]
+
+
+class SkillMatcher:
+    """Term table plus a trigram index over the taxonomy (see skill_catalog.derive_sections)"""
+
+    def __init__(self, terms: Mapping[str, str], trigram_index: Mapping[str, List[str]]):
+        # Every spelling we accept -> taxonomy term
+        self.terms = terms
+        # Trigram -> taxonomy terms, for the fuzzy stage (single-word terms only)
+        self.trigram_index = trigram_index
+
+    def _lookup(self, candidate: str) -> Optional[str]:
+        term = self.terms.get(candidate)
+        if term is None:
+            # Versioned spellings: python3, react-18, vue.js-3.2
+            stripped = VERSION_SUFFIX.sub("", candidate)
+            if stripped and stripped != candidate:
+                term = self.terms.get(stripped)
+        return term
+
+    def fuzzy(self, token: str) -> Optional[Tuple[str, float]]:
+        """Closest taxonomy term sharing trigrams with the token (Dice coefficient)"""
+        grams = trigrams(token)
+        shared = Counter()
+        for gram in grams:
+            for term in self.trigram_index.get(gram, ()):
+                shared[term] += 1
+        best = None
+        for term, count in shared.items():
+            if token.startswith(term):
+                # A longer word built on the skill name ("expressive", "reactive") is a different word
+                continue
+            score = 2 * count / (len(grams) + len(trigrams(term)))
+            if score < FUZZY_CANDIDATE_THRESHOLD:
+                continue
+            accepted = (
+                score >= FUZZY_THRESHOLD
+                or is_transposition(token, term)
+                or (len(term) >= SINGLE_EDIT_MIN_LENGTH and within_one_edit(token, term))
+            )
+            if accepted and (best is None or score > best[1]):
+                best = (term, score)
+        return best
+
+    def match(self, text: str) -> Set[str]:
+        """Taxonomy terms found in text"""
+        tokens = [token.rstrip(".-") for token in TOKEN_PATTERN.findall(text.lower())]
+        found: Set[str] = set()
+        matched = [False] * len(tokens)
+
+        # Exact and alias lookups on 1-3 token phrases, longest first: once a phrase matches,
+        # the shorter terms inside it are skipped ("java script" is JavaScript, not also Java)
+        i = 0
+        while i < len(tokens):
+            for length in range(min(MAX_PHRASE_TOKENS, len(tokens) - i), 0, -1):
+                term = self._lookup(" ".join(tokens[i:i + length]))
+                if term is None and length == 2:
+                    # Words split by PDF extraction ("kuber netes", "java script")
+                    term = self.terms.get(tokens[i] + tokens[i + 1])
+                if term:
+                    found.add(term)
+                    for j in range(i, i + length):
+                        matched[j] = True
+                    i += length
+                    break
+            else:
+                i += 1
+
+        # Compound words: "python-based", "docker-compose", "express.js", "react-redux"
+        for i, token in enumerate(tokens):
+            if matched[i]:
+                continue
+            parts = [part for part in TOKEN_PART_SEPARATORS.split(token) if part]
+            # A trailing ".js" names a JavaScript library, not JavaScript itself
+            if len(parts) > 1 and parts[-1] == "js":
+                parts.pop()
+            if parts == [token]:
+                continue
+            for part in parts:
+                term = self._lookup(part)
+                if term:
+                    found.add(term)
+                    matched[i] = True
+
+        # Misspellings: only unmatched tokens, scored against skills sharing trigrams
+        checked: Set[str] = set()
+        for i, token in enumerate(tokens):
+            if matched[i] or len(token) < FUZZY_MIN_LENGTH or token in checked:
+                continue
+            checked.add(token)
+            result = self.fuzzy(token)
+            if result:
+                found.add(result[0])
+        return found
+
+
+# Shared matcher for this process
+skill_matcher = SkillMatcher(skill_catalog.section("skill_terms"), skill_catalog.section("skill_trigrams"))
@@ -1,38 +1,119 @@
 #!/usr/bin/env python3
 """
 Startup script for the Mavericks Resume Analyzer Backend
+
+    python start_server.py                # development: one process with auto-reload
+    python start_server.py --production   # production: preloaded gunicorn/uvicorn workers
 """
 
-import uvicorn
+import argparse
+import gc
 import os
+
+import uvicorn
 from dotenv import load_dotenv
 
+# Serving settings (the frontend expects port 8002)
+DEFAULT_PORT = 8002
+KEEP_ALIVE_SECONDS = int(os.getenv("KEEP_ALIVE_SECONDS", "5"))
+GRACEFUL_TIMEOUT_SECONDS = int(os.getenv("GRACEFUL_TIMEOUT_SECONDS", "30"))
+WORKER_TIMEOUT_SECONDS = int(os.getenv("WORKER_TIMEOUT_SECONDS", "120"))
+
+
+def default_workers() -> int:
+    """One worker unless WEB_CONCURRENCY says otherwise.
+
+    Issued assessments and analyses are shared host-wide, but dashboards, leaderboards, score
+    analytics and the resume index still live in each worker's memory, so more workers need a
+    load balancer that routes each user to the same worker (see README)"""
+    return int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
+def run_production(host: str, port: int, workers: int):
+    """Gunicorn master with Uvicorn workers; the app is imported once before forking"""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        # gunicorn is POSIX-only; fall back to uvicorn's own process manager (no preloading)
+        print("⚠️ gunicorn not installed - starting uvicorn workers without preloading")
+        uvicorn.run("main:app", host=host, port=port, workers=workers,
+                    timeout_keep_alive=KEEP_ALIVE_SECONDS, timeout_graceful_shutdown=GRACEFUL_TIMEOUT_SECONDS)
+        return
+
+    class PreloadedApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Import main and the SDKs it loads lazily once, so workers start without paying for
+            # the imports. Forked workers do not keep those pages shared for long - touching an
+            # object updates its reference count - so the catalog data lives in the mapped file
+            from main import app, preload_heavy_dependencies
+            preload_heavy_dependencies()
+            # Keep the workers' garbage collections from walking everything imported so far
+            gc.freeze()
+            return app
+
+    PreloadedApplication({
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "keepalive": KEEP_ALIVE_SECONDS,
+        # SIGTERM: stop accepting, let in-flight requests (LLM calls, uploads) finish for this long
+        "graceful_timeout": GRACEFUL_TIMEOUT_SECONDS,
+        "timeout": WORKER_TIMEOUT_SECONDS,
+    }).run()
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Start the Mavericks backend")
+    parser.add_argument("--production", action="store_true", default=os.getenv("SERVER_MODE") == "production",
+                        help="multi-worker serving without auto-reload (or set SERVER_MODE=production)")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", DEFAULT_PORT)))
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="worker processes (default WEB_CONCURRENCY or 1; more need sticky sessions)")
+    args = parser.parse_args()
+
     # Load environment variables
     load_dotenv()
-    
-    # Check if Gemini API key is set (optional for testing)
-    api_key = os.getenv("GEMINI_API_KEY")
+
+    # Check if Cohere API key is set (optional for testing)
+    api_key = os.getenv("COHERE_API_KEY")
     if not api_key:
-        print("⚠️ Warning: GEMINI_API_KEY not found - using fallback mode")
+        print("⚠️ Warning: COHERE_API_KEY not found - using fallback mode")
         print("Some features may be limited. For full functionality, create a .env file with:")
-        print("GEMINI_API_KEY=your_api_key_here")
+        print("COHERE_API_KEY=your_api_key_here")
     else:
-        print("✅ Gemini API Key loaded successfully")
+        print("✅ Cohere API Key loaded successfully")
     print("🚀 Starting Mavericks Resume Analyzer Backend...")
-    print("📍 Server will be available at: http://localhost:8000")
-    print("📊 Health check: http://localhost:8000/health")
+    print(f"📍 Server will be available at: http://localhost:{args.port}")
+    print(f"📊 Health check: http://localhost:{args.port}/health")
+    if args.production:
+        print(f"🏭 Production mode: {args.workers} workers, keep-alive {KEEP_ALIVE_SECONDS}s, graceful drain {GRACEFUL_TIMEOUT_SECONDS}s")
+        if args.workers > 1:
+            print("⚠️ Per-user state lives in each worker - route every user to the same worker (sticky sessions)")
     print("🛑 Press Ctrl+C to stop the server")
     print("-" * 50)
-    
-    # Start the server
+
+    if args.production:
+        run_production(args.host, args.port, args.workers)
+        return
+
+    # Start the development server
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
+        host=args.host,
+        port=args.port,
         reload=True,
         log_level="info"
     )
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,178 @@
+"""
+Startup Timing
+Measures cold-start cost: per-module import time while the app is imported, time
+spent in startup hooks and in lazily loaded dependencies, and time to the first
+request served
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import Dict, List, Optional
+
+# Modules slower than this are listed individually in the report
+REPORT_MIN_MS = float(os.getenv("STARTUP_REPORT_MIN_MS", "1"))
+REPORT_TOP_MODULES = 25
+
+
+class _TimedLoader:
+    """Wraps a module loader to time exec_module; restores the real loader afterwards"""
+
+    def __init__(self, loader, timer: "StartupTimer", name: str):
+        self._loader = loader
+        self._timer = timer
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer._enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._exit(self._name)
+            module.__loader__ = self._loader
+            if module.__spec__ is not None:
+                module.__spec__.loader = self._loader
+
+    def __getattr__(self, attribute):
+        return getattr(self._loader, attribute)
+
+
+class _TimingFinder(MetaPathFinder):
+    """Meta path hook that lets the regular finders locate modules, then times their execution"""
+
+    def __init__(self, timer: "StartupTimer"):
+        self._timer = timer
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self._timer, fullname)
+                return spec
+        return None
+
+
+class StartupTimer:
+    """Collects import, startup and first-request timings for one process"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self._finder: Optional[_TimingFinder] = None
+        self._stack: List[List] = []
+        self._modules: Dict[str, Dict] = {}
+        self._lazy: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.import_seconds: Optional[float] = None
+        self.startup_began: Optional[float] = None
+        self.startup_seconds: Optional[float] = None
+        self.first_request_seconds: Optional[float] = None
+
+    # --- Import timing ---
+
+    def install(self):
+        """Start timing every module imported from now on"""
+        self.started_at = time.perf_counter()
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        """Stop timing imports; called once the app module has finished importing"""
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+        self.import_seconds = time.perf_counter() - self.started_at
+
+    def _enter(self, name: str):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, name: str):
+        _, started, children = self._stack.pop()
+        inclusive = time.perf_counter() - started
+        self._modules[name] = {
+            "inclusive_ms": inclusive * 1000,
+            "self_ms": (inclusive - children) * 1000,
+            # Imported directly by the app module rather than by another module
+            "direct": not self._stack
+        }
+        if self._stack:
+            self._stack[-1][2] += inclusive
+
+    # --- Lazy dependencies, startup hooks and first request ---
+
+    @contextmanager
+    def measure(self, name: str):
+        """Time a lazily loaded dependency (e.g. the first Cohere import)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._lazy[name] = (time.perf_counter() - started) * 1000
+
+    def startup_begin(self):
+        self.startup_began = time.perf_counter()
+
+    def startup_end(self):
+        if self.startup_began is not None:
+            self.startup_seconds = time.perf_counter() - self.startup_began
+
+    def first_request_served(self):
+        with self._lock:
+            if self.first_request_seconds is None:
+                self.first_request_seconds = time.perf_counter() - self.started_at
+
+    def report(self) -> Dict:
+        direct = {name: timing["inclusive_ms"] for name, timing in self._modules.items() if timing["direct"]}
+        slowest = sorted(self._modules.items(), key=lambda item: item[1]["self_ms"], reverse=True)
+        return {
+            "import_seconds": round(self.import_seconds, 3) if self.import_seconds is not None else None,
+            "startup_hooks_seconds": round(self.startup_seconds, 3) if self.startup_seconds is not None else None,
+            "first_request_seconds": round(self.first_request_seconds, 3) if self.first_request_seconds is not None else None,
+            "modules_imported": len(self._modules),
+            "direct_imports_ms": {
+                name: round(ms, 1)
+                for name, ms in sorted(direct.items(), key=lambda item: item[1], reverse=True)
+                if ms >= REPORT_MIN_MS
+            },
+            "slowest_modules_self_ms": {
+                name: round(timing["self_ms"], 1)
+                for name, timing in slowest[:REPORT_TOP_MODULES]
+                if timing["self_ms"] >= REPORT_MIN_MS
+            },
+            "lazy_loads_ms": {name: round(ms, 1) for name, ms in self._lazy.items()},
+            "lazy_modules_loaded": {name: name in sys.modules for name in ("cohere", "PyPDF2")}
+        }
+
+
+class FirstRequestTimer:
+    """ASGI middleware recording when the first response starts; a pass-through afterwards"""
+
+    def __init__(self, app, timer: StartupTimer):
+        self.app = app
+        self.timer = timer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.timer.first_request_seconds is not None:
+            await self.app(scope, receive, send)
+            return
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                self.timer.first_request_served()
+            await send(message)
+
+        await self.app(scope, receive, timed_send)
+
+
+# Shared timer for this process
+startup_timer = StartupTimer()
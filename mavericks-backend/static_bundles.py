@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Static Assessment Bundles
+Exports predefined assessments, curated videos and warmed cached assessments as
+content-hashed JSON files that a CDN, reverse proxy or the frontend can serve
+without running any Python handler
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Dict, Optional
+
+from fastapi.staticfiles import StaticFiles
+
+from assessment_cache import PREDEFINED_ASSESSMENTS, VIDEO_RECOMMENDATIONS, cached_assessments
+
+STATIC_BUNDLES_DIR = os.getenv(
+    "STATIC_BUNDLES_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "bundles")
+)
+STATIC_BUNDLES_URL = "/static/bundles"
+MANIFEST_FILENAME = "manifest.json"
+
+# Bundles no longer in the manifest are deleted once untouched this long, so clients holding the
+# previous manifest (or another worker exporting at the same time) can still fetch them
+BUNDLE_PRUNE_AGE_SECONDS = float(os.getenv("BUNDLE_PRUNE_AGE_SECONDS", "3600"))
+BUNDLE_FILENAME = re.compile(r"^[a-z0-9\-]+\.[0-9a-f]{12}\.json$")
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles that marks content-hashed files as cacheable forever"""
+
+    def file_response(self, full_path, *args, **kwargs):
+        response = super().file_response(full_path, *args, **kwargs)
+        if os.path.basename(full_path) == MANIFEST_FILENAME:
+            response.headers["Cache-Control"] = "no-cache"
+        else:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+def slugify(name: str) -> str:
+    """File-name friendly version of a skill name"""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "skill"
+
+
+def content_hash(data) -> str:
+    """Short hash of the canonical JSON encoding of data"""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def _write_bundle(output_dir: str, name: str, data: Dict) -> Dict:
+    """Write one bundle as <name>.<hash>.json and return its manifest entry"""
+    digest = content_hash(data)
+    filename = f"{name}.{digest}.json"
+    path = os.path.join(output_dir, filename)
+    if not os.path.exists(path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    else:
+        # Still in use: restart its prune clock
+        os.utime(path)
+    return {
+        "url": f"{STATIC_BUNDLES_URL}/{filename}",
+        "hash": digest,
+        "bytes": os.path.getsize(path)
+    }
+
+
+def _assessment_bundle(skill: str, difficulty: str, questions, source: str) -> Dict:
+    """Assessment document with a stable id derived from its content"""
+    assessment = {
+        "title": f"{skill} Skills Assessment",
+        "difficulty": difficulty,
+        "skills_tested": [skill],
+        "questions": questions,
+        "source": source
+    }
+    assessment["assessment_id"] = f"static_{slugify(skill)}_{content_hash(assessment)}"
+    return assessment
+
+
+def export_static_bundles(output_dir: Optional[str] = None) -> Dict:
+    """Export every static bundle and the manifest; returns the manifest"""
+    output_dir = output_dir or STATIC_BUNDLES_DIR
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest = {"generated_at": int(time.time()), "assessments": {}, "cached_assessments": {}, "videos": None}
+
+    for skill, predefined in PREDEFINED_ASSESSMENTS.items():
+        assessment = _assessment_bundle(skill, "intermediate", predefined["questions"], "predefined")
+        entry = _write_bundle(output_dir, f"assessment-{slugify(skill)}", assessment)
+        entry["assessment_id"] = assessment["assessment_id"]
+        manifest["assessments"][skill] = entry
+
+    # Warmed cached assessments (everything cached on this host so far)
+    for cached_assessment in cached_assessments():
+        skills = cached_assessment.get("skills_tested") or []
+        if len(skills) != 1:
+            continue
+        difficulty = cached_assessment.get("difficulty", "intermediate")
+        assessment = _assessment_bundle(skills[0], difficulty, cached_assessment["questions"], cached_assessment.get("source", "cached"))
+        entry = _write_bundle(output_dir, f"cached-{slugify(skills[0])}-{slugify(difficulty)}", assessment)
+        entry["assessment_id"] = assessment["assessment_id"]
+        manifest["cached_assessments"][f"{skills[0]}_{difficulty}"] = entry
+
+    manifest["videos"] = _write_bundle(output_dir, "videos", dict(VIDEO_RECOMMENDATIONS))
+
+    tmp_path = os.path.join(output_dir, f"{MANIFEST_FILENAME}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(output_dir, MANIFEST_FILENAME))
+    prune_bundles(manifest, output_dir)
+    return manifest
+
+
+def prune_bundles(manifest: Dict, output_dir: str, max_age: float = BUNDLE_PRUNE_AGE_SECONDS) -> int:
+    """Delete bundle files the manifest no longer references and nobody has written for max_age seconds"""
+    entries = [manifest["videos"]] + [
+        entry for section in ("assessments", "cached_assessments") for entry in manifest[section].values()
+    ]
+    referenced = {os.path.basename(entry["url"]) for entry in entries}
+    cutoff = time.time() - max_age
+    removed = 0
+    for filename in os.listdir(output_dir):
+        if filename in referenced or not BUNDLE_FILENAME.match(filename):
+            continue
+        path = os.path.join(output_dir, filename)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except FileNotFoundError:
+            # Pruned by another worker
+            continue
+    if removed:
+        print(f"🧹 Pruned {removed} superseded static bundles")
+    return removed
+
+
+def load_bundle_assessments(manifest: Dict, output_dir: Optional[str] = None) -> Dict[str, Dict]:
+    """Read the exported assessments back, keyed by their stable assessment id"""
+    output_dir = output_dir or STATIC_BUNDLES_DIR
+    assessments = {}
+    for section in ("assessments", "cached_assessments"):
+        for entry in manifest.get(section, {}).values():
+            path = os.path.join(output_dir, os.path.basename(entry["url"]))
+            with open(path, "r", encoding="utf-8") as f:
+                assessments[entry["assessment_id"]] = json.load(f)
+    return assessments
+
+
+def main():
+    manifest = export_static_bundles()
+    print(f"✅ Exported {len(manifest['assessments'])} assessment bundles and the video catalogue")
+    print(f"📁 Output directory: {STATIC_BUNDLES_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Incremental Question Parser
+Pulls complete question objects out of a (possibly truncated) LLM JSON response
+"""
+
+import json
+from typing import Dict, List
+
+
+class IncrementalQuestionParser:
+    """Feed LLM text chunks in; get each question back as soon as its object closes"""
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._object_start = -1
+        self.finished = False
+        self.questions: List[Dict] = []
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Consume a chunk of text and return the questions it completed"""
+        self._buffer += chunk
+        completed = []
+
+        if self.finished:
+            return completed
+
+        if not self._in_array:
+            key_idx = self._buffer.find('"questions"')
+            if key_idx == -1:
+                return completed
+            bracket_idx = self._buffer.find('[', key_idx)
+            if bracket_idx == -1:
+                return completed
+            self._in_array = True
+            self._pos = bracket_idx + 1
+
+        buffer = self._buffer
+        while self._pos < len(buffer):
+            char = buffer[self._pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                if self._depth == 0:
+                    self._object_start = self._pos
+                self._depth += 1
+            elif char == '}' and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    question = self._decode(buffer[self._object_start:self._pos + 1])
+                    if question:
+                        completed.append(question)
+            elif char == ']' and self._depth == 0:
+                # End of the questions array - anything after it is ignored
+                self.finished = True
+                self._pos = len(buffer)
+                break
+            self._pos += 1
+
+        self.questions.extend(completed)
+        return completed
+
+    def _decode(self, text: str):
+        try:
+            question = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(question, dict) or "question" not in question:
+            return None
+        return question
+
+
+def parse_questions_lenient(text: str) -> List[Dict]:
+    """Return every complete question in text, even if the JSON was cut off"""
+    parser = IncrementalQuestionParser()
+    return parser.feed(text)
@@ -0,0 +1,15 @@
+"""
+Shared test setup: import the backend modules from the parent directory and keep the
+files they create at import (compiled skill catalog, shared caches) out of the checkout
+"""
+
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+_scratch = tempfile.mkdtemp(prefix="mavericks-tests-")
+os.environ.setdefault("SKILL_CATALOG_PATH", os.path.join(_scratch, "skill_catalog.bin"))
+os.environ.setdefault("SHARED_CACHE_DIR", _scratch)
@@ -0,0 +1,51 @@
+from event_store import WriteBehindStore
+
+
+def make_store(tmp_path, **kwargs):
+    return WriteBehindStore(str(tmp_path / "events.db"), **kwargs)
+
+
+def test_events_are_buffered_until_flushed(tmp_path):
+    store = make_store(tmp_path)
+    store.append("submission", {"score": 80}, "alice")
+    assert list(store.replay("submission")) == []
+
+    assert store.flush() == 1
+    events = list(store.replay("submission"))
+    assert [(event["user_id"], event["score"]) for event in events] == [("alice", 80)]
+    assert events[0]["created_at"] > 0
+
+
+def test_replay_returns_one_kind_oldest_first(tmp_path):
+    store = make_store(tmp_path, batch_size=2)
+    for score in (10, 20, 30):
+        store.append("submission", {"score": score})
+    store.append("video_upload", {"video_url": "/v.webm"})
+    assert store.flush() == 4
+    assert store.flushes == 2
+
+    assert [event["score"] for event in store.replay("submission")] == [10, 20, 30]
+    assert [event["video_url"] for event in store.replay("video_upload")] == ["/v.webm"]
+
+
+def test_full_buffer_refuses_new_events(tmp_path):
+    store = make_store(tmp_path, max_pending=2)
+    assert store.append("submission", {"score": 1})
+    assert store.append("submission", {"score": 2})
+    assert store.saturated()
+    assert not store.append("submission", {"score": 3})
+    assert store.refused == 1
+
+
+def test_stop_flushes_and_a_new_store_replays_from_disk(tmp_path):
+    store = make_store(tmp_path, flush_seconds=60)
+    store.start()
+    store.append("submission", {"score": 55}, "bob")
+    store.stop()
+
+    reopened = make_store(tmp_path)
+    assert [(event["user_id"], event["score"]) for event in reopened.replay("submission")] == [("bob", 55)]
+
+
+def test_replay_without_a_database_is_empty(tmp_path):
+    assert list(make_store(tmp_path).replay("submission")) == []
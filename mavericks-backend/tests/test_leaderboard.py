@@ -0,0 +1,69 @@
+import random
+
+from leaderboard import IndexableSkipList, Leaderboard
+
+
+def test_skip_list_keeps_values_sorted_through_inserts_and_removes():
+    values = random.Random(7).sample(range(10_000), 500)
+    skip_list = IndexableSkipList(expected_size=1024)
+    for value in values:
+        skip_list.insert(value)
+    for value in values[:200]:
+        skip_list.remove(value)
+
+    expected = sorted(values[200:])
+    assert len(skip_list) == len(expected)
+    assert skip_list.slice(0, len(skip_list)) == expected
+
+
+def test_skip_list_index_is_the_rank_of_each_value():
+    skip_list = IndexableSkipList(expected_size=256)
+    values = random.Random(3).sample(range(1000), 100)
+    for value in values:
+        skip_list.insert(value)
+    for rank, value in enumerate(sorted(values)):
+        assert skip_list.index(value) == rank
+
+
+def test_skip_list_slice_clamps_the_range():
+    skip_list = IndexableSkipList(expected_size=64)
+    for value in range(10):
+        skip_list.insert(value)
+    assert skip_list.slice(3, 6) == [3, 4, 5]
+    assert skip_list.slice(-5, 2) == [0, 1]
+    assert skip_list.slice(8, 50) == [8, 9]
+    assert skip_list.slice(6, 6) == []
+
+
+def test_skip_list_rejects_missing_values():
+    skip_list = IndexableSkipList(expected_size=16)
+    skip_list.insert(1)
+    for operation in (skip_list.index, skip_list.remove):
+        try:
+            operation(2)
+        except KeyError:
+            continue
+        raise AssertionError(f"{operation.__name__} accepted a missing value")
+
+
+def test_leaderboard_ranks_by_points_then_user_id():
+    board = Leaderboard("overall")
+    board.set_points("carol", 50)
+    board.set_points("alice", 80)
+    board.set_points("bob", 80)
+    board.set_points("dave", 10)
+
+    assert [entry["user_id"] for entry in board.top(3)] == ["alice", "bob", "carol"]
+    assert board.rank("dave") == 4
+    assert board.rank("nobody") is None
+
+
+def test_leaderboard_moves_a_user_when_points_change():
+    board = Leaderboard("overall")
+    for user_id, points in [("a", 30), ("b", 20), ("c", 10)]:
+        board.set_points(user_id, points)
+    board.set_points("c", 40)
+
+    assert board.rank("c") == 1
+    assert len(board) == 3
+    assert [entry["user_id"] for entry in board.around("a", radius=1)] == ["c", "a", "b"]
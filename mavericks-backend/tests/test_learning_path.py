@@ -0,0 +1,39 @@
+from learning_path import SKILL_PREREQUISITES, build_learning_path, skill_key
+
+
+def positions(path):
+    return {skill_key(module["skill"]): module["order"] - 1 for module in path}
+
+
+def test_prerequisites_come_before_the_skills_that_need_them():
+    path = build_learning_path(["React", "TypeScript"])
+    order = positions(path)
+    for key, position in order.items():
+        node = SKILL_PREREQUISITES.get(key)
+        for prerequisite in (node.prerequisites if node else ()):
+            assert order[prerequisite] < position, f"{prerequisite} should come before {key}"
+    assert [module["order"] for module in path] == list(range(1, len(path) + 1))
+
+
+def test_missing_prerequisites_are_added_with_a_reason():
+    path = build_learning_path(["React"])
+    by_key = {skill_key(module["skill"]): module for module in path}
+    assert {"react", "javascript", "css", "html"} <= set(by_key)
+    assert by_key["react"]["reason"] == "Weak skill in your assessment"
+    assert by_key["css"]["reason"].startswith("Prerequisite for")
+
+
+def test_known_skills_are_not_repeated():
+    keys = set(positions(build_learning_path(["React"], known_skills=["JavaScript", "HTML"])))
+    assert "javascript" not in keys
+    assert "html" not in keys
+
+
+def test_unknown_skills_get_a_generic_module():
+    path = build_learning_path(["Elixir"])
+    assert [module["skill"] for module in path] == ["Elixir"]
+    assert path[0]["prerequisites"] == []
+
+
+def test_aliases_resolve_to_the_same_node():
+    assert positions(build_learning_path(["reactjs"])) == positions(build_learning_path(["React"]))
@@ -0,0 +1,74 @@
+import pytest
+
+import rate_limiter
+from rate_limiter import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", fake)
+    return fake
+
+
+def test_bucket_allows_a_burst_then_rejects(clock):
+    bucket = TokenBucket(rate=1.0, capacity=3)
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == pytest.approx(1.0)
+
+
+def test_bucket_refills_at_its_rate_up_to_capacity(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    bucket.try_acquire()
+    bucket.try_acquire()
+    clock.now += 0.25
+    assert bucket.try_acquire() == pytest.approx(0.25)
+    clock.now += 0.25
+    assert bucket.try_acquire() == 0.0
+    clock.now += 60
+    assert bucket.wait_time() == 0.0
+    assert bucket.tokens == 2
+
+
+def test_limiter_rejects_once_the_burst_is_spent(clock):
+    limiter = RateLimiter({"submit": (0.5, 2)})
+    assert limiter.check("ip:1", "submit") == 0.0
+    assert limiter.check("ip:1", "submit") == 0.0
+    assert limiter.check("ip:1", "submit") == pytest.approx(2.0)
+    assert limiter.rejected == 1
+    # Other clients and unlimited endpoints are unaffected
+    assert limiter.check("ip:2", "submit") == 0.0
+    assert limiter.check("ip:1", "unlimited") == 0.0
+
+
+def test_multiplier_scales_rate_and_burst(clock):
+    limiter = RateLimiter({"submit": (1.0, 2)})
+    allowed = 0
+    while limiter.check("ip:1", "submit", multiplier=2.0) == 0.0:
+        allowed += 1
+    assert allowed == 4
+
+
+def test_check_all_takes_no_token_when_any_bucket_is_empty(clock):
+    limiter = RateLimiter({"generate": (1.0, 1)})
+    assert limiter.check("user:a", "generate") == 0.0
+    # The user bucket is empty, so the IP bucket must keep its token
+    assert limiter.check_all([("ip:1", 1.0), ("user:a", 1.0)], "generate") > 0
+    assert limiter.check("ip:1", "generate") == 0.0
+
+
+def test_least_recently_used_clients_are_forgotten(clock):
+    limiter = RateLimiter({"submit": (0.1, 1)}, max_clients=2)
+    limiter.check("a", "submit")
+    limiter.check("b", "submit")
+    limiter.check("c", "submit")
+    # "a" was evicted, so it starts again with a full bucket
+    assert limiter.check("a", "submit") == 0.0
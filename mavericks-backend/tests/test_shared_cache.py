@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from shared_cache import SharedMemoryCache, fcntl
+
+pytestmark = pytest.mark.skipif(fcntl is None, reason="shared memory cache needs POSIX file locks")
+
+
+def make_cache(tmp_path, buckets=4, ways=2, slot_bytes=256, ttl_seconds=60.0):
+    return SharedMemoryCache(str(tmp_path / "cache"), buckets, ways, slot_bytes, ttl_seconds)
+
+
+def test_put_then_get_returns_the_value(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.put("python_beginner", b'{"questions":[]}')
+    created, value = cache.get("python_beginner")
+    assert value == b'{"questions":[]}'
+    assert created is not None
+
+
+def test_get_skips_the_copy_when_the_caller_holds_the_current_entry(tmp_path):
+    cache = make_cache(tmp_path)
+    created = time.time()
+    cache.put("key", b"value", created=created)
+    assert cache.get("key", known_created=created) == (created, None)
+
+
+def test_missing_key_is_a_miss(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.get("absent") == (None, None)
+    assert cache.stats()["this_process"]["misses"] == 1
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    cache = make_cache(tmp_path, ttl_seconds=30)
+    cache.put("old", b"value", created=time.time() - 31)
+    cache.put("fresh", b"value")
+    assert cache.get("old") == (None, None)
+    assert [key for key, _, _ in cache.items()] == ["fresh"]
+
+
+def test_full_bucket_evicts_its_least_recently_used_entry(tmp_path):
+    cache = make_cache(tmp_path, buckets=1, ways=2)
+    cache.put("a", b"1", created=time.time() - 2)
+    cache.put("b", b"2", created=time.time() - 1)
+    cache.get("a")  # a is now the most recently used
+    cache.put("c", b"3")
+
+    assert cache.get("b") == (None, None)
+    assert cache.get("a")[1] == b"1"
+    assert cache.get("c")[1] == b"3"
+    assert cache.stats()["this_process"]["evictions"] == 1
+
+
+def test_oversized_values_are_refused(tmp_path):
+    cache = make_cache(tmp_path, slot_bytes=128)
+    assert not cache.put("big", b"x" * 200)
+    assert cache.get("big") == (None, None)
+    assert cache.stats()["this_process"]["oversized"] == 1
+
+
+def test_entries_are_visible_to_another_mapping_of_the_file(tmp_path):
+    writer = make_cache(tmp_path)
+    reader = make_cache(tmp_path)
+    writer.put("shared", b"value")
+    assert reader.get("shared")[1] == b"value"
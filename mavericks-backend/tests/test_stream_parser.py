@@ -0,0 +1,51 @@
+import json
+
+from stream_parser import IncrementalQuestionParser, parse_questions_lenient
+
+QUESTIONS = [
+    {"question": "What does {} create in Python?", "options": ["dict", "set", "list", "tuple"], "correct_answer": "dict"},
+    {"question": "Escaped \"quotes\" and a } brace", "options": ["a", "b"], "correct_answer": "a"},
+    {"question": "Nested", "options": ["x"], "correct_answer": "x", "meta": {"topic": "[arrays]"}},
+]
+RESPONSE = "Here is the assessment:\n" + json.dumps({"questions": QUESTIONS}) + "\nGood luck!"
+
+
+def feed_in_chunks(text, size):
+    parser = IncrementalQuestionParser()
+    found = []
+    for start in range(0, len(text), size):
+        found.extend(parser.feed(text[start:start + size]))
+    return parser, found
+
+
+def test_every_chunk_size_yields_the_same_questions():
+    for size in range(1, 40):
+        parser, found = feed_in_chunks(RESPONSE, size)
+        assert found == QUESTIONS, f"chunk size {size}"
+        assert parser.finished
+
+
+def test_a_question_is_returned_as_soon_as_its_object_closes():
+    first = json.dumps(QUESTIONS[0])
+    parser = IncrementalQuestionParser()
+    assert parser.feed('{"questions": [' + first[:-1]) == []
+    assert parser.feed(first[-1] + ",") == [QUESTIONS[0]]
+
+
+def test_truncated_response_keeps_the_complete_questions():
+    cut = RESPONSE[:RESPONSE.index('"Nested"')]
+    parser, found = feed_in_chunks(cut, 7)
+    assert found == QUESTIONS[:2]
+    assert not parser.finished
+    assert parse_questions_lenient(cut) == QUESTIONS[:2]
+
+
+def test_text_after_the_array_is_ignored():
+    parser = IncrementalQuestionParser()
+    parser.feed('{"questions": []}')
+    assert parser.finished
+    assert parser.feed('{"question": "late"}') == []
+
+
+def test_objects_without_a_question_are_skipped():
+    assert parse_questions_lenient('{"questions": [{"note": "no question"}, {"question": "Q?"}]}') == [{"question": "Q?"}]